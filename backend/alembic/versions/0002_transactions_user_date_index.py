@@ -0,0 +1,24 @@
+"""index transactions by user and date
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transactions_user_id_transaction_date', 'transactions', ['user_id', 'transaction_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_transaction_date', table_name='transactions')
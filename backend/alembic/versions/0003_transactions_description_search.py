@@ -0,0 +1,48 @@
+"""full-text and trigram indexes on transaction descriptions
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:02:00.000000
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.exc import DBAPIError
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    # Must match models.transaction.description_search_vector for the planner to use it
+    op.create_index(
+        'ix_transactions_description_fts',
+        'transactions',
+        [sa.text("to_tsvector('english', coalesce(description, ''))")],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+    # Fuzzy search needs pg_trgm; without it search uses the full-text index only
+    bind = op.get_bind()
+    try:
+        with bind.begin_nested():
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.execute(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_description_trgm "
+                "ON transactions USING gin (description gin_trgm_ops)"
+            )
+    except DBAPIError as e:
+        logger.warning("Skipping ix_transactions_description_trgm, pg_trgm is unavailable: %s", e.orig)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_transactions_description_trgm")
+    op.drop_index('ix_transactions_description_fts', table_name='transactions')
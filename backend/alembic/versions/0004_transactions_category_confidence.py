@@ -0,0 +1,24 @@
+"""add transactions.category_confidence
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('category_confidence', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('transactions', 'category_confidence')
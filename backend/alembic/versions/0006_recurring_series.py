@@ -0,0 +1,47 @@
+"""add recurring_series
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('recurring_series',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=True),
+    sa.Column('merchant_key', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('average_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('cadence', sa.String(length=20), nullable=False),
+    sa.Column('occurrence_count', sa.Integer(), nullable=True),
+    sa.Column('first_date', sa.Date(), nullable=False),
+    sa.Column('last_date', sa.Date(), nullable=False),
+    sa.Column('next_expected_date', sa.Date(), nullable=False),
+    sa.Column('reminded_for_date', sa.Date(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'merchant_key', name='uq_recurring_series_user_merchant')
+    )
+    op.create_index(op.f('ix_recurring_series_next_expected_date'), 'recurring_series', ['next_expected_date'], unique=False)
+    op.create_index(op.f('ix_recurring_series_user_id'), 'recurring_series', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recurring_series_user_id'), table_name='recurring_series')
+    op.drop_index(op.f('ix_recurring_series_next_expected_date'), table_name='recurring_series')
+    op.drop_table('recurring_series')
@@ -0,0 +1,38 @@
+"""add budget_period_balances
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 09:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('budget_period_balances',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('budget_id', sa.UUID(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('budget_limit', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('spent', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('closing_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('budget_id', 'period_start', name='uq_budget_period_balances_budget_period')
+    )
+    op.create_index(op.f('ix_budget_period_balances_budget_id'), 'budget_period_balances', ['budget_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_budget_period_balances_budget_id'), table_name='budget_period_balances')
+    op.drop_table('budget_period_balances')
@@ -0,0 +1,48 @@
+"""add budget_adjustment_proposals and life_events.adjustment_status
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 09:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing events got their adjustments synchronously, so they have nothing pending
+    op.add_column('life_events', sa.Column('adjustment_status', sa.String(length=20), nullable=False, server_default='ready'))
+    op.alter_column('life_events', 'adjustment_status', server_default=None)
+
+    op.create_table('budget_adjustment_proposals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('life_event_id', sa.UUID(), nullable=False),
+    sa.Column('budget_id', sa.UUID(), nullable=False),
+    sa.Column('current_limit', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('proposed_limit', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('adjustment_percentage', sa.Numeric(precision=7, scale=2), nullable=True),
+    sa.Column('reasoning', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['life_event_id'], ['life_events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budget_adjustment_proposals_life_event_id'), 'budget_adjustment_proposals', ['life_event_id'], unique=False)
+    op.create_index(op.f('ix_budget_adjustment_proposals_user_id'), 'budget_adjustment_proposals', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_budget_adjustment_proposals_user_id'), table_name='budget_adjustment_proposals')
+    op.drop_index(op.f('ix_budget_adjustment_proposals_life_event_id'), table_name='budget_adjustment_proposals')
+    op.drop_table('budget_adjustment_proposals')
+    op.drop_column('life_events', 'adjustment_status')
@@ -0,0 +1,42 @@
+"""move write stamps off users into user_write_stamps
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('user_write_stamps',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('last_write_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('data_version', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(
+        "INSERT INTO user_write_stamps (user_id, last_write_at, data_version) "
+        "SELECT id, last_write_at, data_version FROM users WHERE last_write_at IS NOT NULL"
+    )
+    op.drop_column('users', 'data_version')
+    op.drop_column('users', 'last_write_at')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('last_write_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE users SET last_write_at = s.last_write_at, data_version = s.data_version "
+        "FROM user_write_stamps s WHERE s.user_id = users.id"
+    )
+    op.drop_table('user_write_stamps')
@@ -0,0 +1,87 @@
+"""
+Compare the default list-response path against the orjson fast path.
+
+Default path: ORM-like objects -> List[TransactionResponse] validation/serialization -> json.dumps
+              (what FastAPI does for a response_model with Pydantic v2)
+Fast path:    column tuples -> dicts -> orjson
+
+Run from the backend directory:
+    python benchmarks/bench_serialization.py --rows 100 --repeat 2000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from schemas.transaction import TransactionResponse
+from utils.serialization import dumps, rows_to_dicts
+
+FIELDS = list(TransactionResponse.model_fields)
+RESPONSE_ADAPTER = TypeAdapter(list[TransactionResponse])
+
+
+def make_rows(count: int) -> list[tuple]:
+    """Build synthetic transaction rows in TransactionResponse field order."""
+    user_id = uuid.uuid4()
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        rows.append((
+            uuid.uuid4(),
+            user_id,
+            uuid.uuid4() if i % 4 else None,
+            Decimal(f"{(i * 37) % 500}.{i % 100:02d}"),
+            f"Purchase #{i} at Some Merchant",
+            today - timedelta(days=i),
+            "card",
+            i % 10 == 0,
+            None,
+            now - timedelta(days=i),
+        ))
+    return rows
+
+
+def default_path(objects: list) -> bytes:
+    validated = RESPONSE_ADAPTER.validate_python(objects, from_attributes=True)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    return dumps(rows_to_dicts(FIELDS, rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=1000, help="Responses serialized per timing run")
+    args = parser.parse_args()
+    
+    rows = make_rows(args.rows)
+    objects = [SimpleNamespace(**dict(zip(FIELDS, row))) for row in rows]
+    
+    # Both paths must produce equivalent documents
+    assert len(json.loads(default_path(objects))) == len(json.loads(fast_path(rows)))
+    
+    default_time = min(timeit.repeat(lambda: default_path(objects), number=args.repeat, repeat=3))
+    fast_time = min(timeit.repeat(lambda: fast_path(rows), number=args.repeat, repeat=3))
+    
+    per_default = default_time / args.repeat * 1e6
+    per_fast = fast_time / args.repeat * 1e6
+    print(f"rows per response: {args.rows}")
+    print(f"default path: {per_default:10.1f} us/response")
+    print(f"fast path:    {per_fast:10.1f} us/response")
+    print(f"speedup:      {per_default / per_fast:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure cold application startup: the time to import main (and build the app)
+in a fresh interpreter, plus the slowest imports reported by -X importtime.
+
+Run from the backend directory:
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(extra_args: list[str]) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *extra_args, "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"import main failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def slowest_imports(importtime_output: str, top: int) -> list[tuple[int, str]]:
+    """Parse -X importtime output into (cumulative microseconds, module) pairs."""
+    entries = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|", 2)
+        entries.append((int(cumulative_us.strip()), module.rstrip()))
+    entries.sort(reverse=True)
+    return entries[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+    
+    timings = [time_import([])[0] for _ in range(args.runs)]
+    print(f"import main over {args.runs} runs: "
+          f"median {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms")
+    
+    _, importtime_output = time_import(["-X", "importtime"])
+    print("\nslowest imports (cumulative):")
+    for cumulative_us, module in slowest_imports(importtime_output, args.top):
+        print(f"{cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
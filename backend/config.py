@@ -5,6 +5,16 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # 0 disables the timeout
+    DB_EXPORT_STATEMENT_TIMEOUT_MS: int = 120000
+    READ_DATABASE_URL: Optional[str] = None  # Read replica for reports and analytics
+    READ_YOUR_WRITES_WINDOW_SECONDS: int = 10  # Read from primary this long after a user's write
+    ACCOUNT_PURGE_BATCH_SIZE: int = 5000  # Rows deleted per statement when purging an account
     
     # JWT
     JWT_SECRET: str
@@ -12,10 +22,32 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Admin
+    ADMIN_API_KEY: Optional[str] = None  # Enables /api/admin when set (sent as X-Admin-Key)
+    PROVISIONING_HASH_WORKERS: Optional[int] = None  # Password hashing processes; defaults to CPU count
+    PROVISIONING_CHUNK_SIZE: int = 500  # Rows per multi-row INSERT
+    
     # AI Service
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     AI_PROVIDER: str = "openai"  # or "anthropic"
+    AI_USAGE_TRACKING_ENABLED: bool = True  # Persist per-call tokens, latency and cost to ai_usage_records
+    AI_BACKENDS: str = ""  # "provider:model,..." to route across; defaults to AI_PROVIDER's model
+    AI_FAST_BACKENDS: str = ""  # Cheaper/faster backends for short tasks such as spending insights
+    AI_HEDGE_AFTER_MS: int = 0  # Race a second backend when the first has not answered; 0 disables
+    AI_REQUEST_TIMEOUT_SECONDS: float = 30.0
+    AI_BACKEND_COOLDOWN_SECONDS: int = 30  # Skip a backend this long after repeated failures
+    AI_ROUTER_WORKERS: int = 16  # Threads for hedged and failover provider calls
+    AI_ASK_CACHE_ENABLED: bool = True  # Reuse answers to similar questions until the user's data changes
+    AI_ASK_CACHE_THRESHOLD: float = 0.85  # Minimum TF-IDF cosine similarity for a cache hit
+    AI_ASK_CACHE_TTL_SECONDS: int = 900  # Bounds staleness from writes made outside a user's session
+    AI_SNAPSHOT_CACHE_TTL_SECONDS: int = 300  # Bounds staleness from writes made outside a user's session
+    
+    # Auto-categorization
+    AUTO_CATEGORIZE_ENABLED: bool = True
+    AUTO_CATEGORIZE_MIN_CONFIDENCE: float = 0.6
+    AUTO_CATEGORIZE_MIN_EXAMPLES: int = 5  # Categorized transactions needed before predicting
+    AUTO_CATEGORIZE_TRAINING_LIMIT: int = 5000  # Most recent transactions used for training
     
     # Email Service
     SENDGRID_API_KEY: Optional[str] = None
@@ -27,6 +59,30 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
     
+    # Performance
+    FAST_JSON_RESPONSES: bool = False  # Serialize list/export endpoints with orjson
+    METRICS_ENABLED: bool = True  # Request/SQL metrics and the Prometheus /metrics endpoint
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 500
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1  # Share of slow SELECTs re-run under EXPLAIN ANALYZE (Postgres)
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = 5
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    # Per-user token buckets: "METHOD /path=burst/seconds", comma separated
+    RATE_LIMIT_RULES: str = "POST /api/ai/analyze=5/60,POST /api/ai/ask=20/60,POST /api/reports/export=10/60"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Share buckets across workers (requires the redis package)
+    
+    # Tracing
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "jsonl"  # "jsonl" (local file) or "otlp" (OTLP/HTTP JSON collector)
+    TRACING_JSONL_PATH: str = "logs/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATE: float = 1.0  # Share of new traces recorded
+    TRACING_SERVICE_NAME: str = "budgeting-assistant-api"
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
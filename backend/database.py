@@ -1,18 +1,335 @@
-from sqlalchemy import create_engine
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from fastapi import Depends
+from sqlalchemy import DateTime, Integer, column, create_engine, event, literal, select, table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from config import settings
+from utils.metrics import current_route
 
-engine = create_engine(settings.DATABASE_URL)
+IS_POSTGRES = make_url(settings.DATABASE_URL).get_backend_name() == "postgresql"
+
+
+def _connect_args() -> dict:
+    """Apply the default statement timeout to every new Postgres connection."""
+    if IS_POSTGRES and settings.DB_STATEMENT_TIMEOUT_MS:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _create_engine(url: str):
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for reporting and analytics queries
+read_engine = _create_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+
 Base = declarative_base()
 
 
+class PoolMetrics:
+    """Connection pool checkout counters and wait times."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+    
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+    
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+pool_metrics = PoolMetrics(engine)
+read_pool_metrics = PoolMetrics(read_engine) if read_engine else None
+
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("slow_queries")
+
+# Only plain reads are re-executed under EXPLAIN ANALYZE
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+_explain_executor = None
+_explain_slots = threading.BoundedSemaphore(2)  # Skip EXPLAIN rather than queue behind a backlog
+
+
+def parameter_shape(parameters, executemany: bool):
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _explain(bind_engine, statement, parameters) -> list:
+    """Re-run a read under EXPLAIN (ANALYZE, BUFFERS) on a separate pooled connection."""
+    with bind_engine.connect().execution_options(slow_query_log=False) as conn:
+        try:
+            rows = conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters).all()
+            return [row[0] for row in rows]
+        finally:
+            conn.rollback()
+
+
+def _write_slow_query(record: dict, bind_engine=None, statement=None, parameters=None):
+    if bind_engine is not None:
+        try:
+            record["plan"] = _explain(bind_engine, statement, parameters)
+        except Exception as e:
+            record["plan_error"] = str(e)
+        finally:
+            _explain_slots.release()
+    slow_query_logger.info(json.dumps(record, default=str))
+
+
+def _start_slow_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+def _record_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS or not conn.get_execution_options().get("slow_query_log", True):
+        return
+    
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(elapsed_ms, 2),
+        "route": current_route(),
+        "statement": statement,
+        "parameters": parameter_shape(parameters, executemany),
+        "plan": None,
+    }
+    explain = (
+        conn.engine.dialect.name == "postgresql"
+        and not executemany
+        and _EXPLAINABLE.match(statement)
+        and not _WRITE_KEYWORDS.search(statement)
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        and _explain_slots.acquire(blocking=False)
+    )
+    if explain:
+        # Off the request path: the plan is captured by re-running the query elsewhere
+        _explain_executor.submit(_write_slow_query, record, conn.engine, statement, parameters)
+    else:
+        _write_slow_query(record)
+
+
+def _discard_slow_query_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so the
+    # pooled connection's next statement is not timed from it
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("slow_query_start"):
+        conn.info["slow_query_start"].pop()
+
+
+def install_slow_query_log(bind_engine):
+    """Log statements slower than SLOW_QUERY_THRESHOLD_MS to a rotating JSON-lines file."""
+    global _explain_executor
+    if not slow_query_logger.handlers:
+        directory = os.path.dirname(settings.SLOW_QUERY_LOG_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            settings.SLOW_QUERY_LOG_PATH,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUP_COUNT
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.setLevel(logging.INFO)
+        slow_query_logger.propagate = False
+    if _explain_executor is None:
+        _explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+    event.listen(bind_engine, "before_cursor_execute", _start_slow_query_timer)
+    event.listen(bind_engine, "after_cursor_execute", _record_slow_query)
+    event.listen(bind_engine, "handle_error", _discard_slow_query_timer)
+
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    install_slow_query_log(engine)
+    if read_engine is not None:
+        install_slow_query_log(read_engine)
+
+
+# Core views of the tables written here; models import this module, so it can't import them
+_users = table("users", column("id", UUID(as_uuid=True)))
+_write_stamps = table(
+    "user_write_stamps",
+    column("user_id", UUID(as_uuid=True)),
+    column("last_write_at", DateTime(timezone=True)),
+    column("data_version", Integer),
+)
+
+# Derived data materialized on reads; writing it is not a change to the user's data
+UNSTAMPED_TABLES = {"budget_period_balances", "ai_usage_records"}
+
+
+def _mark_user_write(session, tables):
+    if session.info.get("user_id") is not None and any(name not in UNSTAMPED_TABLES for name in tables):
+        session.info["pending_write_stamp"] = True
+
+
+def _stamp_user_write(user_id):
+    """
+    Record the user's write time and bump their data version in user_write_stamps.
+    Runs after the commit in its own short transaction, so the user's concurrent writes
+    never queue behind a lock held for a whole transaction.
+    """
+    stamp = pg_insert(_write_stamps).from_select(
+        ["user_id", "last_write_at", "data_version"],
+        # Selecting from users skips users purged by the transaction
+        select(_users.c.id, literal(datetime.now(timezone.utc), DateTime(timezone=True)), literal(1)).where(
+            _users.c.id == user_id
+        )
+    )
+    stamp = stamp.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "last_write_at": stamp.excluded.last_write_at,
+            "data_version": _write_stamps.c.data_version + 1,
+        }
+    )
+    try:
+        with engine.begin() as conn:
+            conn.execute(stamp)
+    except Exception:
+        # The data is already committed; caches still expire on their TTL
+        logger.exception("Could not stamp write for user %s", user_id)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    _mark_user_write(session, {
+        obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)
+    })
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_user_write(orm_execute_state.session, {orm_execute_state.statement.table.name})
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _stamp_committed_writes(session):
+    if session.info.pop("pending_write_stamp", None):
+        _stamp_user_write(session.info["user_id"])
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _clear_write_stamp_on_rollback(session, previous_transaction):
+    # A rolled-back savepoint leaves the outer transaction's writes in place
+    if previous_transaction.parent is None:
+        session.info.pop("pending_write_stamp", None)
+
+
+def _apply_statement_timeout(session, transaction, connection):
+    """Re-apply a per-request statement timeout override to each new transaction."""
+    timeout_ms = session.info.get("statement_timeout_ms")
+    if timeout_ms is not None and IS_POSTGRES:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+event.listen(SessionLocal, "after_begin", _apply_statement_timeout)
+if ReadSessionLocal is not None:
+    event.listen(ReadSessionLocal, "after_begin", _apply_statement_timeout)
+
+
+def set_statement_timeout(db: Session, timeout_ms: int) -> Session:
+    """Override the statement timeout for the rest of a session's lifetime."""
+    db.info["statement_timeout_ms"] = timeout_ms
+    if IS_POSTGRES and db.in_transaction():
+        db.connection().exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+    return db
+
+
+def _checkout(db: Session, metrics: PoolMetrics):
+    """Check out the session's connection up front so pool wait time is measured."""
+    start = time.perf_counter()
+    try:
+        db.connection()
+    except PoolTimeoutError:
+        metrics.record_timeout()
+        raise
+    metrics.record_checkout(time.perf_counter() - start)
+
+
 def get_db():
     db = SessionLocal()
     try:
+        _checkout(db, pool_metrics)
         yield db
     finally:
         db.close()
 
+
+def open_read_session() -> Session:
+    """Open a session on the read replica; callers must close it."""
+    db = ReadSessionLocal()
+    try:
+        _checkout(db, read_pool_metrics)
+    except Exception:
+        db.close()
+        raise
+    return db
+
+
+def get_db_with_timeout(timeout_ms: int):
+    """Dependency factory overriding the statement timeout for the request's session."""
+    def _get_db(db: Session = Depends(get_db)) -> Session:
+        return set_statement_timeout(db, timeout_ms)
+    
+    return _get_db
@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from config import settings
-from database import engine, Base
-from routers import auth, user, transactions, budget, category, ai, alerts, reports
+from database import engine, read_engine, pool_metrics, read_pool_metrics
+from utils.metrics import REGISTRY, MetricsMiddleware, instrument_engine
+from utils import tracing
+from utils.rate_limit import RateLimitMiddleware, build_rate_limiter
+from routers import auth, user, transactions, budget, category, ai, alerts, reports, rules, recurring, admin, dashboard
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic migrations (or `python manage.py init-db`), not at import time
 
 app = FastAPI(
     title="AI-Powered Budgeting Assistant API",
@@ -13,6 +16,11 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Rate limiting sits inside CORS so 429 responses still carry CORS headers
+rate_limiter = build_rate_limiter(settings)
+if rate_limiter is not None:
+    app.add_middleware(RateLimitMiddleware, **rate_limiter)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,8 +28,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_LOG_ENABLED:
+    # Added last so it wraps every other middleware and sees the full request time;
+    # the slow-query log also uses it to find the route that issued a statement
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    if read_engine is not None:
+        instrument_engine(read_engine)
+
+tracing.configure_tracing(settings)
+if tracing.tracer.enabled:
+    app.add_middleware(tracing.TracingMiddleware)
+    tracing.instrument_engine(engine)
+    if read_engine is not None:
+        tracing.instrument_engine(read_engine)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(user.router)
@@ -31,6 +55,10 @@ app.include_router(category.router)
 app.include_router(ai.router)
 app.include_router(alerts.router)
 app.include_router(reports.router)
+app.include_router(rules.router)
+app.include_router(recurring.router)
+app.include_router(dashboard.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -46,3 +74,33 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/health/db")
+async def database_health():
+    """Connection pool checkout and wait-time metrics."""
+    return {
+        "primary": pool_metrics.snapshot(),
+        "replica": read_pool_metrics.snapshot() if read_pool_metrics else None,
+    }
+
+
+def _pool_gauges() -> dict:
+    gauges = {}
+    for pool_name, metrics in (("primary", pool_metrics), ("replica", read_pool_metrics)):
+        if metrics is None:
+            continue
+        snapshot = metrics.snapshot()
+        for key in ("checked_out", "overflow", "checkouts", "timeouts", "wait_seconds_total", "wait_seconds_max"):
+            gauges[f"db_pool_{pool_name}_{key}"] = (f"Connection pool {key.replace('_', ' ')} ({pool_name})", snapshot[key])
+    return gauges
+
+
+REGISTRY.add_collector(_pool_gauges)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("", status_code=404)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
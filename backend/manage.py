@@ -0,0 +1,82 @@
+"""
+Management commands.
+
+Usage:
+    python manage.py init-db          Create all tables directly (development; use Alembic in production)
+    python manage.py purge-deleted    Finish purging accounts whose deletion was interrupted
+    python manage.py provision-users FILE
+                                      Create users from a CSV (header row) or JSON list
+"""
+import argparse
+import csv
+import json
+
+
+def init_db(args):
+    """Create database tables for all models."""
+    from database import engine, Base
+    import models  # noqa: F401 - registers every model on Base.metadata
+    
+    Base.metadata.create_all(bind=engine)
+    print("Database tables created")
+
+
+def purge_deleted(args):
+    """Purge the data of every account marked deleted."""
+    from services.account_service import purge_deleted_users
+    
+    count = purge_deleted_users()
+    print(f"Purged {count} deleted account(s)")
+
+
+def provision_users(args):
+    """Bulk-create users from a CSV or JSON file."""
+    from pydantic import ValidationError
+    from database import SessionLocal
+    from schemas.admin import ProvisionUser
+    from services.auth_service import provision_users as provision
+    
+    with open(args.file, newline="") as f:
+        if args.file.endswith(".json"):
+            records = json.load(f)
+        else:
+            # Empty CSV cells mean "not provided"
+            records = [{key: value for key, value in row.items() if value} for row in csv.DictReader(f)]
+    
+    users = []
+    for line, record in enumerate(records, start=1):
+        try:
+            users.append(ProvisionUser(**record))
+        except ValidationError as e:
+            print(f"Record {line} invalid: {e.errors()[0]['msg']}")
+    
+    db = SessionLocal()
+    try:
+        created, skipped = provision(db, users)
+    finally:
+        db.close()
+    for user in skipped:
+        print(f"Skipped {user['username']} <{user['email']}>: {user['reason']}")
+    print(f"Created {created} user(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budgeting Assistant management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    init_db_parser = subparsers.add_parser("init-db", help="Create database tables")
+    init_db_parser.set_defaults(func=init_db)
+    
+    purge_parser = subparsers.add_parser("purge-deleted", help="Purge accounts marked deleted")
+    purge_parser.set_defaults(func=purge_deleted)
+    
+    provision_parser = subparsers.add_parser("provision-users", help="Bulk-create users from a file")
+    provision_parser.add_argument("file", help="CSV with a header row, or a JSON list of users")
+    provision_parser.set_defaults(func=provision_users)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
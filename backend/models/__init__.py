@@ -1,19 +1,30 @@
-from .user import User, FinancialProfile
+from .user import User, FinancialProfile, UserWriteStamp
 from .category import Category
 from .budget import Budget
+from .budget_period_balance import BudgetPeriodBalance
 from .transaction import Transaction
 from .life_event import LifeEvent
+from .budget_adjustment_proposal import BudgetAdjustmentProposal
 from .ai_insight import AIInsight
+from .ai_usage_record import AIUsageRecord
 from .alert import Alert
+from .category_rule import CategoryRule
+from .recurring_series import RecurringSeries
 
 __all__ = [
     "User",
     "FinancialProfile",
+    "UserWriteStamp",
     "Category",
     "Budget",
+    "BudgetPeriodBalance",
     "Transaction",
     "LifeEvent",
+    "BudgetAdjustmentProposal",
     "AIInsight",
+    "AIUsageRecord",
     "Alert",
+    "CategoryRule",
+    "RecurringSeries",
 ]
 
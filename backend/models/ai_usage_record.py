@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, Float, Numeric, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from database import Base
+
+
+class AIUsageRecord(Base):
+    """One AI provider call (or rule-based fallback) with its tokens, latency, outcome and cost."""
+    __tablename__ = "ai_usage_records"
+    __table_args__ = (
+        Index("ix_ai_usage_records_user_created", "user_id", "created_at"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    operation = Column(String(50), nullable=False)
+    provider = Column(String(20), nullable=False)  # openai, anthropic, rule_based
+    model = Column(String(100))
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    latency_ms = Column(Float, nullable=False, default=0)
+    outcome = Column(String(20), nullable=False)  # success, timeout, error, parse_error, fallback
+    estimated_cost = Column(Numeric(10, 6), nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    user = relationship("User", back_populates="ai_usage_records")
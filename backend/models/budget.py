@@ -14,10 +14,11 @@ class Budget(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
     monthly_limit = Column(Numeric(10, 2), nullable=False)
-    budget_period = Column(String(20), default="monthly")
+    budget_period = Column(String(20), default="monthly")  # weekly, monthly, quarterly, yearly
     rollover_enabled = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
+    period_balances = relationship("BudgetPeriodBalance", back_populates="budget", cascade="all, delete-orphan")
 
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Text, Numeric, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from database import Base
+
+
+class BudgetAdjustmentProposal(Base):
+    """Budget limit suggested after a life event, applied by the user via PATCH /api/budget/bulk."""
+    __tablename__ = "budget_adjustment_proposals"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    life_event_id = Column(UUID(as_uuid=True), ForeignKey("life_events.id", ondelete="CASCADE"), nullable=False, index=True)
+    budget_id = Column(UUID(as_uuid=True), ForeignKey("budgets.id", ondelete="CASCADE"), nullable=False)
+    current_limit = Column(Numeric(10, 2), nullable=False)
+    proposed_limit = Column(Numeric(10, 2), nullable=False)
+    adjustment_percentage = Column(Numeric(7, 2))
+    reasoning = Column(Text)
+    status = Column(String(20), nullable=False, default="pending")  # pending, applied
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    user = relationship("User", back_populates="budget_adjustment_proposals")
+    life_event = relationship("LifeEvent", back_populates="proposals")
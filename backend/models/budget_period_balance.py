@@ -0,0 +1,26 @@
+from sqlalchemy import Column, ForeignKey, DateTime, Date, UniqueConstraint
+from sqlalchemy import Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from database import Base
+
+
+class BudgetPeriodBalance(Base):
+    """Closed budget period with its spend and the balance carried into the next period."""
+    __tablename__ = "budget_period_balances"
+    __table_args__ = (
+        UniqueConstraint("budget_id", "period_start", name="uq_budget_period_balances_budget_period"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    budget_id = Column(UUID(as_uuid=True), ForeignKey("budgets.id", ondelete="CASCADE"), nullable=False, index=True)
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)  # Exclusive
+    budget_limit = Column(Numeric(10, 2), nullable=False)
+    spent = Column(Numeric(12, 2), nullable=False)
+    closing_balance = Column(Numeric(12, 2), nullable=False)  # Carried into the next period
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    budget = relationship("Budget", back_populates="period_balances")
@@ -18,4 +18,5 @@ class Category(Base):
     user = relationship("User", back_populates="categories")
     budgets = relationship("Budget", back_populates="category", cascade="all, delete-orphan")
     transactions = relationship("Transaction", back_populates="category")
+    rules = relationship("CategoryRule", back_populates="category", cascade="all, delete-orphan")
 
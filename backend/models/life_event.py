@@ -14,7 +14,9 @@ class LifeEvent(Base):
     event_type = Column(String(50), nullable=False)
     event_date = Column(Date, nullable=False)
     description = Column(Text)
+    adjustment_status = Column(String(20), nullable=False, default="pending")  # pending, ready, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="life_events")
+    proposals = relationship("BudgetAdjustmentProposal", back_populates="life_event", cascade="all, delete-orphan", passive_deletes=True)
 
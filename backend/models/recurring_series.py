@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, Date, UniqueConstraint
+from sqlalchemy import Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from database import Base
+
+
+class RecurringSeries(Base):
+    __tablename__ = "recurring_series"
+    __table_args__ = (
+        UniqueConstraint("user_id", "merchant_key", name="uq_recurring_series_user_merchant"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    merchant_key = Column(String(200), nullable=False)  # Normalized description
+    description = Column(Text)
+    average_amount = Column(Numeric(10, 2), nullable=False)
+    cadence = Column(String(20), nullable=False)  # weekly, biweekly, monthly, quarterly, annual
+    occurrence_count = Column(Integer, default=0)
+    first_date = Column(Date, nullable=False)
+    last_date = Column(Date, nullable=False)
+    next_expected_date = Column(Date, nullable=False, index=True)
+    reminded_for_date = Column(Date)  # Due date of the last reminder alert sent
+    is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    user = relationship("User", back_populates="recurring_series")
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Date, Text
-from sqlalchemy import Numeric
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Date, Text, Index
+from sqlalchemy import Numeric, Float, event, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -9,10 +10,15 @@ from database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Serves the per-user date-range scans behind summaries and reports
+        Index("ix_transactions_user_id_transaction_date", "user_id", "transaction_date"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True, index=True)
+    category_confidence = Column(Float)  # Set when the category was assigned automatically
     amount = Column(Numeric(10, 2), nullable=False)
     description = Column(Text)
     transaction_date = Column(Date, nullable=False, index=True)
@@ -24,3 +30,35 @@ class Transaction(Base):
     user = relationship("User", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
 
+
+# Full-text search vector over descriptions. Queries must use this exact expression
+# for Postgres to match it against the GIN index below.
+description_search_vector = func.to_tsvector(
+    text("'english'"),
+    func.coalesce(Transaction.__table__.c.description, text("''"))
+)
+
+Index(
+    "ix_transactions_description_fts",
+    description_search_vector,
+    postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+
+
+@event.listens_for(Transaction.__table__, "after_create")
+def _create_trigram_index(target, connection, **kw):
+    """
+    Add a trigram index for fuzzy description search (migration 0003 does the same).
+    Skipped when the pg_trgm extension cannot be installed; search then uses full-text only.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    try:
+        with connection.begin_nested():
+            connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            connection.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_description_trgm "
+                "ON transactions USING gin (description gin_trgm_ops)"
+            )
+    except DBAPIError:
+        pass
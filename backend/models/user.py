@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, Numeric, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Text, Numeric, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,15 +17,20 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True))  # Set when deletion is requested; rows are purged in the background
     
-    # Relationships
-    financial_profile = relationship("FinancialProfile", back_populates="user", uselist=False)
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
-    life_events = relationship("LifeEvent", back_populates="user", cascade="all, delete-orphan")
-    ai_insights = relationship("AIInsight", back_populates="user", cascade="all, delete-orphan")
-    alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    # Relationships (children are removed by ON DELETE CASCADE, not loaded by the ORM)
+    financial_profile = relationship("FinancialProfile", back_populates="user", uselist=False, passive_deletes=True)
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    life_events = relationship("LifeEvent", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    budget_adjustment_proposals = relationship("BudgetAdjustmentProposal", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    ai_insights = relationship("AIInsight", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    ai_usage_records = relationship("AIUsageRecord", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    category_rules = relationship("CategoryRule", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    recurring_series = relationship("RecurringSeries", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class FinancialProfile(Base):
@@ -40,3 +45,11 @@ class FinancialProfile(Base):
     
     user = relationship("User", back_populates="financial_profile")
 
+
+class UserWriteStamp(Base):
+    """Last write per user, kept off the users row; upserted by database._stamp_user_write after each commit."""
+    __tablename__ = "user_write_stamps"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_write_at = Column(DateTime(timezone=True), nullable=False)  # Read-your-writes routing
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Keys caches of derived data
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from database import get_db
+from routers.auth import require_admin
+from schemas.admin import ProvisionUsersRequest, ProvisionUsersResponse, AIUsageSummaryResponse
+from services.auth_service import provision_users
+from services.ai_usage_service import summarize_usage
+from services.ai_router import ai_router
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.post("/users/bulk", response_model=ProvisionUsersResponse)
+def bulk_provision_users(
+    request: ProvisionUsersRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Provision a cohort of users with profiles and default categories.
+    Declared sync so FastAPI runs it in the threadpool while passwords are hashed.
+    """
+    created, skipped = provision_users(db, request.users)
+    return ProvisionUsersResponse(created=created, skipped=skipped)
+
+
+@router.get("/ai-usage", response_model=AIUsageSummaryResponse)
+def ai_usage_summary(
+    days: int = Query(30, ge=1, le=365),
+    top_users: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """AI calls, tokens, latency and estimated cost by provider, model and outcome."""
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return summarize_usage(db, since, top_users)
+
+
+@router.get("/ai-backends")
+def ai_backend_health():
+    """Rolling latency, error rate and health of each AI backend, by tier."""
+    return ai_router.snapshot()
@@ -1,39 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_
 from database import get_db
+from config import settings
 from models.transaction import Transaction
-from models.budget import Budget
 from models.category import Category
 from models.life_event import LifeEvent
+from models.budget import Budget
+from models.budget_adjustment_proposal import BudgetAdjustmentProposal
 from models.ai_insight import AIInsight
-from models.user import FinancialProfile
-from routers.auth import get_current_user
+from routers.auth import get_current_user, get_read_db
 from models.user import User
 from schemas.ai import (
     AIAnalysisRequest, AIAnalysisResponse, LifeEventRequest, LifeEventResponse,
-    AIInsightResponse, AIAskRequest, AIAskResponse
+    AIInsightResponse, AIAskRequest, AIAskResponse,
+    BudgetAdjustmentProposalResponse, LifeEventProposalsResponse
 )
 from services.ai_service import ai_service
+from services.answer_cache import answer_cache
+from services.snapshot_service import snapshot_cache, budget_limits, data_version
+from services.life_event_service import compute_proposals_in_background
+from utils.serialization import FastJSONResponse, response_columns, rows_to_dicts
 from typing import List
+from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 router = APIRouter(prefix="/api/ai", tags=["ai"])
 
+INSIGHT_FIELDS, INSIGHT_COLUMNS = response_columns(AIInsight, AIInsightResponse)
+
 
 @router.post("/analyze", response_model=AIAnalysisResponse)
 async def analyze_spending(
     request: AIAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Trigger AI analysis of spending patterns."""
     # Get transactions for the specified number of months
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=request.months * 30)
     
-    transactions = db.query(Transaction).filter(
+    rows = db.query(
+        Transaction.transaction_date, Transaction.amount, Transaction.description, Category.name
+    ).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).filter(
         and_(
             Transaction.user_id == current_user.id,
             Transaction.transaction_date >= start_date
@@ -41,37 +54,27 @@ async def analyze_spending(
     ).all()
     
     # Format transactions for AI
-    transaction_data = []
-    for txn in transactions:
-        category = db.query(Category).filter(Category.id == txn.category_id).first()
-        transaction_data.append({
-            "date": txn.transaction_date.isoformat(),
-            "category": category.name if category else "Uncategorized",
-            "amount": float(txn.amount),
-            "description": txn.description or ""
-        })
-    
-    # Get financial profile
-    profile = db.query(FinancialProfile).filter(
-        FinancialProfile.user_id == current_user.id
-    ).first()
-    
-    monthly_income = Decimal(profile.monthly_income) if profile and profile.monthly_income else Decimal(0)
-    
-    # Get current budgets
-    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
-    current_budgets = {}
-    for budget in budgets:
-        category = db.query(Category).filter(Category.id == budget.category_id).first()
-        if category:
-            current_budgets[category.name] = budget.monthly_limit
+    transaction_data = [
+        {
+            "date": txn_date.isoformat(),
+            "category": category_name or "Uncategorized",
+            "amount": float(amount),
+            "description": description or ""
+        }
+        for txn_date, amount, description, category_name in rows
+    ]
+    
+    # Income and budgets come from the cached snapshot
+    snapshot = snapshot_cache.get(db, current_user.id)
     
     # Get AI analysis
     analysis = ai_service.analyze_spending_patterns(
         transaction_data,
-        monthly_income,
-        current_budgets,
-        request.months
+        Decimal(str(snapshot["monthly_income"])),
+        budget_limits(snapshot),
+        request.months,
+        user_id=current_user.id,
+        snapshot=snapshot
     )
     
     # Map category names to IDs
@@ -86,61 +89,78 @@ async def analyze_spending(
     return analysis
 
 
-@router.post("/life-event", response_model=LifeEventResponse)
+@router.post("/life-event", response_model=LifeEventResponse, status_code=status.HTTP_202_ACCEPTED)
 async def log_life_event(
     event_data: LifeEventRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Log a life event and get AI-adjusted budget recommendations."""
-    # Create life event
+    """
+    Log a life event. Budget adjustments are computed in the background and stored as
+    proposals; poll GET /life-event/{id}/proposals until adjustment_status is "ready".
+    """
     event = LifeEvent(
         user_id=current_user.id,
         event_type=event_data.event_type,
         event_date=datetime.fromisoformat(event_data.event_date).date(),
-        description=event_data.description
+        description=event_data.description,
+        adjustment_status="pending"
     )
     db.add(event)
     db.commit()
     db.refresh(event)
     
-    # Get current budgets and spending patterns
-    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
-    current_budgets = {}
-    spending_patterns = {}
-    
-    for budget in budgets:
-        category = db.query(Category).filter(Category.id == budget.category_id).first()
-        if category:
-            current_budgets[category.name] = budget.monthly_limit
-            
-            # Calculate average spending
-            avg_spent = db.query(func.avg(Transaction.amount)).filter(
-                and_(
-                    Transaction.user_id == current_user.id,
-                    Transaction.category_id == budget.category_id
-                )
-            ).scalar() or Decimal(0)
-            spending_patterns[category.name] = avg_spent
+    background_tasks.add_task(compute_proposals_in_background, current_user.id, event.id)
+    return event
+
+
+@router.get("/life-event/{event_id}/proposals", response_model=LifeEventProposalsResponse)
+async def get_life_event_proposals(
+    event_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Budget adjustment proposals for a life event, for applying via PATCH /api/budget/bulk."""
+    event = db.query(LifeEvent).filter(
+        and_(
+            LifeEvent.id == event_id,
+            LifeEvent.user_id == current_user.id
+        )
+    ).first()
     
-    # Get AI recommendations
-    adjustments = ai_service.adapt_budget_for_life_event(
-        event_data.event_type,
-        event_data.description or "",
-        current_budgets,
-        spending_patterns
-    )
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Life event not found"
+        )
     
-    # Store insights
-    insight = AIInsight(
-        user_id=current_user.id,
-        insight_type="life_event",
-        content=f"Life event: {event_data.event_type}. {adjustments.get('overall_advice', '')}"
+    rows = db.query(BudgetAdjustmentProposal, Budget.category_id, Category.name).join(
+        Budget, Budget.id == BudgetAdjustmentProposal.budget_id
+    ).join(
+        Category, Category.id == Budget.category_id
+    ).filter(
+        BudgetAdjustmentProposal.life_event_id == event.id
+    ).order_by(Category.name).all()
+    
+    return LifeEventProposalsResponse(
+        event=event,
+        proposals=[
+            BudgetAdjustmentProposalResponse(
+                id=proposal.id,
+                budget_id=proposal.budget_id,
+                category_id=category_id,
+                category_name=category_name,
+                current_limit=proposal.current_limit,
+                proposed_limit=proposal.proposed_limit,
+                adjustment_percentage=proposal.adjustment_percentage,
+                reasoning=proposal.reasoning,
+                status=proposal.status,
+                created_at=proposal.created_at
+            )
+            for proposal, category_id, category_name in rows
+        ]
     )
-    db.add(insight)
-    db.commit()
-    
-    return event
 
 
 @router.get("/insights", response_model=List[AIInsightResponse])
@@ -149,37 +169,31 @@ async def get_insights(
     db: Session = Depends(get_db)
 ):
     """Get latest AI insights and tips."""
-    insights = db.query(AIInsight).filter(
+    query = db.query(AIInsight).filter(
         AIInsight.user_id == current_user.id
-    ).order_by(AIInsight.created_at.desc()).limit(10).all()
+    ).order_by(AIInsight.created_at.desc()).limit(10)
+    
+    if settings.FAST_JSON_RESPONSES:
+        rows = query.with_entities(*INSIGHT_COLUMNS).all()
+        return FastJSONResponse(rows_to_dicts(INSIGHT_FIELDS, rows))
     
-    return insights
+    return query.all()
 
 
 @router.post("/ask", response_model=AIAskResponse)
 async def ask_ai(
     request: AIAskRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Ask AI a question about budget/finances."""
-    # Gather context
-    profile = db.query(FinancialProfile).filter(
-        FinancialProfile.user_id == current_user.id
-    ).first()
-    
-    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
-    budget_data = {}
-    for budget in budgets:
-        category = db.query(Category).filter(Category.id == budget.category_id).first()
-        if category:
-            budget_data[category.name] = float(budget.monthly_limit)
+    version = data_version(db, current_user.id)
+    cached = answer_cache.get(current_user.id, request.question, version)
+    if cached is not None:
+        return AIAskResponse(answer=cached)
     
-    context = {
-        "monthly_income": float(profile.monthly_income) if profile and profile.monthly_income else 0,
-        "budgets": budget_data
-    }
+    context = snapshot_cache.get(db, current_user.id)
     
-    answer = ai_service.answer_question(request.question, context)
+    answer = ai_service.answer_question(request.question, context, user_id=current_user.id, data_version=version)
     return AIAskResponse(answer=answer)
 
@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from database import get_db
+from config import settings
 from models.alert import Alert
 from routers.auth import get_current_user
 from models.user import User
 from schemas.alert import AlertResponse, AlertPreferencesResponse, AlertPreferencesUpdate
+from utils.serialization import FastJSONResponse, response_columns, rows_to_dicts
 from typing import List
 
 router = APIRouter(prefix="/api/alerts", tags=["alerts"])
 
+ALERT_FIELDS, ALERT_COLUMNS = response_columns(Alert, AlertResponse)
+
 
 @router.get("", response_model=List[AlertResponse])
 async def get_alerts(
@@ -22,7 +26,13 @@ async def get_alerts(
     if unread_only:
         query = query.filter(Alert.is_read == False)
     
-    alerts = query.order_by(Alert.created_at.desc()).all()
+    query = query.order_by(Alert.created_at.desc())
+    
+    if settings.FAST_JSON_RESPONSES:
+        rows = query.with_entities(*ALERT_COLUMNS).all()
+        return FastJSONResponse(rows_to_dicts(ALERT_FIELDS, rows))
+    
+    alerts = query.all()
     return alerts
 
 
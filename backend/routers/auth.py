@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from database import get_db
-from models.user import User
+from database import get_db, ReadSessionLocal, open_read_session, set_statement_timeout
+from config import settings
+from models.user import User, UserWriteStamp
 from schemas.auth import (
     RegisterRequest, LoginRequest, TokenResponse, RefreshTokenRequest,
     ForgotPasswordRequest, ResetPasswordRequest
@@ -11,8 +12,10 @@ from services.auth_service import create_user, authenticate_user, create_tokens
 from utils.security import decode_token, get_password_hash, verify_password
 from utils.validators import validate_password
 from services.email_service import email_service
+import hmac
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -32,16 +35,68 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # Lets commits on this session be attributed to the user (read-your-writes)
+    db.info["user_id"] = user.id
     return user
 
 
+def get_read_db(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Session for read-only endpoints.
+    Uses the read replica when configured, unless the user wrote recently. The user's
+    last write time is stored in user_write_stamps, so this holds across workers.
+    """
+    last_write = None
+    if ReadSessionLocal is not None:
+        last_write = db.query(UserWriteStamp.last_write_at).filter(
+            UserWriteStamp.user_id == current_user.id
+        ).scalar()
+    if ReadSessionLocal is None or (
+        last_write is not None
+        and datetime.now(timezone.utc) - last_write < timedelta(seconds=settings.READ_YOUR_WRITES_WINDOW_SECONDS)
+    ):
+        yield db
+        return
+    
+    # Return the primary connection before taking a replica one; current_user stays
+    # readable, detached with the columns already loaded
+    db.close()
+    read_db = open_read_session()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+def get_export_db(db: Session = Depends(get_read_db)) -> Session:
+    """Read session with the longer statement timeout used by exports."""
+    return set_statement_timeout(db, settings.DB_EXPORT_STATEMENT_TIMEOUT_MS)
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """Allow the request only with the configured admin API key."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
+
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: RegisterRequest,
@@ -92,7 +147,7 @@ async def refresh_token(
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -115,7 +170,7 @@ async def forgot_password(
     db: Session = Depends(get_db)
 ):
     """Request password reset email."""
-    user = db.query(User).filter(User.email == request.email).first()
+    user = db.query(User).filter(User.email == request.email, User.deleted_at.is_(None)).first()
     if not user:
         # Don't reveal if email exists
         return {"message": "If the email exists, a password reset link has been sent"}
@@ -153,7 +208,7 @@ async def reset_password(
             detail="Reset token has expired"
         )
     
-    user = db.query(User).filter(User.id == token_data["user_id"]).first()
+    user = db.query(User).filter(User.id == token_data["user_id"], User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, update
 from database import get_db
 from models.budget import Budget
+from models.budget_period_balance import BudgetPeriodBalance
+from models.budget_adjustment_proposal import BudgetAdjustmentProposal
 from models.category import Category
-from models.transaction import Transaction
 from routers.auth import get_current_user
 from models.user import User
 from schemas.budget import (
-    BudgetCreate, BudgetUpdate, BudgetResponse, BudgetStatusResponse
+    BudgetCreate, BudgetUpdate, BudgetResponse, BudgetStatusResponse, BulkBudgetUpdate
 )
+from services.budget_service import build_budget_status
 from typing import List
-from decimal import Decimal
-from datetime import date
 
 router = APIRouter(prefix="/api/budget", tags=["budget"])
 
@@ -76,6 +76,63 @@ async def create_budget(
     return budget
 
 
+@router.patch("/bulk", response_model=List[BudgetResponse])
+async def bulk_update_budgets(
+    request: BulkBudgetUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update several budget limits at once, e.g. to apply life-event proposals.
+    Proposals are applied at their proposed limit unless `updates` overrides it.
+    """
+    limits = {}
+    if request.proposal_ids:
+        proposals = db.query(BudgetAdjustmentProposal).filter(
+            and_(
+                BudgetAdjustmentProposal.id.in_(request.proposal_ids),
+                BudgetAdjustmentProposal.user_id == current_user.id
+            )
+        ).all()
+        if len(proposals) != len(set(request.proposal_ids)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proposal not found"
+            )
+        limits.update({proposal.budget_id: proposal.proposed_limit for proposal in proposals})
+    limits.update({update.budget_id: update.monthly_limit for update in request.updates})
+    
+    if not limits:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No budget updates given"
+        )
+    
+    owned = db.query(func.count(Budget.id)).filter(
+        and_(
+            Budget.id.in_(list(limits)),
+            Budget.user_id == current_user.id
+        )
+    ).scalar()
+    if owned != len(limits):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found"
+        )
+    
+    # One executemany UPDATE by primary key for all limits
+    db.execute(update(Budget), [
+        {"id": budget_id, "monthly_limit": limit} for budget_id, limit in limits.items()
+    ])
+    if request.proposal_ids:
+        db.query(BudgetAdjustmentProposal).filter(
+            BudgetAdjustmentProposal.id.in_(request.proposal_ids)
+        ).update({BudgetAdjustmentProposal.status: "applied"}, synchronize_session=False)
+    db.commit()
+    
+    return db.query(Budget).filter(Budget.id.in_(list(limits))).all()
+
+
 @router.put("/{budget_id}", response_model=BudgetResponse)
 async def update_budget(
     budget_id: str,
@@ -99,8 +156,12 @@ async def update_budget(
     
     if budget_data.monthly_limit is not None:
         budget.monthly_limit = budget_data.monthly_limit
-    if budget_data.budget_period is not None:
+    if budget_data.budget_period is not None and budget_data.budget_period != budget.budget_period:
         budget.budget_period = budget_data.budget_period
+        # Materialized periods no longer line up with the new period length
+        db.query(BudgetPeriodBalance).filter(
+            BudgetPeriodBalance.budget_id == budget.id
+        ).delete(synchronize_session=False)
     if budget_data.rollover_enabled is not None:
         budget.rollover_enabled = budget_data.rollover_enabled
     
@@ -139,39 +200,8 @@ async def get_budget_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get budget status (spent vs limit) for all categories."""
-    # Get current month
-    today = date.today()
-    month_start = date(today.year, today.month, 1)
-    
-    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
-    
-    status_list = []
-    for budget in budgets:
-        # Calculate spent this month
-        spent = db.query(func.sum(Transaction.amount)).filter(
-            and_(
-                Transaction.user_id == current_user.id,
-                Transaction.category_id == budget.category_id,
-                Transaction.transaction_date >= month_start
-            )
-        ).scalar() or Decimal(0)
-        
-        category = db.query(Category).filter(Category.id == budget.category_id).first()
-        
-        remaining = budget.monthly_limit - spent
-        percentage_used = float((spent / budget.monthly_limit * 100) if budget.monthly_limit > 0 else 0)
-        
-        status_list.append(BudgetStatusResponse(
-            category_id=budget.category_id,
-            category_name=category.name if category else "Unknown",
-            budget_limit=budget.monthly_limit,
-            spent=spent,
-            remaining=remaining,
-            percentage_used=percentage_used
-        ))
-    
-    return status_list
+    """Get budget status (spent vs limit) for each budget's current period."""
+    return build_budget_status(db, current_user.id)
 
 
 @router.post("/category", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 from database import get_db
 from models.category import Category
+from models.transaction import Transaction
 from routers.auth import get_current_user
 from models.user import User
 from schemas.category import CategoryCreate, CategoryResponse
-from typing import List
+from services.rule_service import rule_engine
+from services.budget_service import invalidate_balances
+from services.categorization_service import categorization_service
+from typing import List, Optional
+from datetime import date
 
 router = APIRouter(prefix="/api/budget/category", tags=["categories"])
 
@@ -59,10 +64,14 @@ async def create_category(
 @router.delete("/{category_id}")
 async def delete_category(
     category_id: str,
+    reassign_to: Optional[str] = Query(None, description="Move the category's transactions to this category"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Delete a custom category (cannot delete default categories)."""
+    """
+    Delete a custom category (cannot delete default categories).
+    Its transactions become uncategorized, or move to `reassign_to` in one UPDATE.
+    """
     category = db.query(Category).filter(
         and_(
             Category.id == category_id,
@@ -82,7 +91,33 @@ async def delete_category(
             detail="Cannot delete default category"
         )
     
+    if reassign_to is not None:
+        target = db.query(Category).filter(
+            and_(
+                Category.id == reassign_to,
+                Category.user_id == current_user.id
+            )
+        ).first()
+        if not target or target.id == category.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Target category not found"
+            )
+        db.execute(
+            update(Transaction).where(
+                and_(
+                    Transaction.user_id == current_user.id,
+                    Transaction.category_id == category.id
+                )
+            ).values(category_id=target.id, category_confidence=None),
+            execution_options={"synchronize_session": False}
+        )
+        invalidate_balances(db, current_user.id, [target.id], date.min)
+    
     db.delete(category)
     db.commit()
+    # The category's rules were deleted with it, and the model learned its transactions
+    rule_engine.invalidate(current_user.id)
+    categorization_service.invalidate(current_user.id)
     return {"message": "Category deleted successfully"}
 
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from database import get_db
+from models.alert import Alert
+from models.ai_insight import AIInsight
+from routers.auth import get_current_user
+from routers.transactions import build_transaction_summary
+from models.user import User
+from schemas.dashboard import DashboardResponse
+from services.budget_service import build_budget_status
+from datetime import date
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    alerts_limit: int = Query(5, ge=1, le=20),
+    insights_limit: int = Query(3, ge=1, le=10),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Everything the dashboard shows, gathered with one authentication and one session.
+    Alerts and insights are limited server-side instead of trimmed by the client.
+    """
+    today = date.today()
+    month_start = date(today.year, today.month, 1)
+    
+    unread = db.query(Alert).filter(
+        Alert.user_id == current_user.id,
+        Alert.is_read == False
+    )
+    
+    return DashboardResponse(
+        month_start=month_start,
+        budget_status=build_budget_status(db, current_user.id, today),
+        summary=build_transaction_summary(db, current_user.id, month_start, today),
+        alerts=unread.order_by(Alert.created_at.desc()).limit(alerts_limit).all(),
+        unread_alert_count=unread.with_entities(func.count(Alert.id)).scalar(),
+        insights=db.query(AIInsight).filter(
+            AIInsight.user_id == current_user.id
+        ).order_by(AIInsight.created_at.desc()).limit(insights_limit).all()
+    )
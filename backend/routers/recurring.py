@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from database import get_db
+from models.recurring_series import RecurringSeries
+from routers.auth import get_current_user
+from models.user import User
+from schemas.recurring import RecurringSeriesResponse, UpcomingChargeResponse, BillReminderResponse
+from services.recurring_service import detect_all, project_upcoming, create_bill_reminders
+from typing import List
+
+router = APIRouter(prefix="/api/recurring", tags=["recurring"])
+
+
+@router.get("", response_model=List[RecurringSeriesResponse])
+async def get_recurring_series(
+    include_inactive: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get detected recurring charges, next due first."""
+    query = db.query(RecurringSeries).filter(RecurringSeries.user_id == current_user.id)
+    if not include_inactive:
+        query = query.filter(RecurringSeries.is_active == True)
+    return query.order_by(RecurringSeries.next_expected_date).all()
+
+
+@router.post("/detect", response_model=List[RecurringSeriesResponse])
+async def detect_recurring_series(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rescan transaction history for recurring charges."""
+    return detect_all(db, current_user.id)
+
+
+@router.get("/upcoming", response_model=List[UpcomingChargeResponse])
+async def get_upcoming_charges(
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get expected recurring charges over the next `days` days."""
+    return [
+        UpcomingChargeResponse(
+            series_id=charge["series"].id,
+            description=charge["series"].description,
+            cadence=charge["series"].cadence,
+            due_date=charge["due_date"],
+            amount=charge["amount"]
+        )
+        for charge in project_upcoming(db, current_user.id, days)
+    ]
+
+
+@router.post("/reminders", response_model=BillReminderResponse)
+async def send_bill_reminders(
+    days: int = Query(3, ge=1, le=30),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create bill reminder alerts for charges due within `days` days."""
+    alerts = create_bill_reminders(db, current_user.id, days)
+    return BillReminderResponse(created=len(alerts))
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from database import get_db
+from sqlalchemy import and_, func, cast, literal, literal_column, select, DateTime, Interval, Numeric
+from config import settings
 from models.transaction import Transaction
 from models.category import Category
 from models.user import FinancialProfile
-from routers.auth import get_current_user
+from routers.auth import get_current_user, get_read_db, get_export_db
 from models.user import User
 from schemas.report import (
     DateRangeRequest, SpendingTrendsResponse, SpendingTrendDataPoint,
     CategoryBreakdownResponse, CategoryBreakdownItem,
     IncomeVsExpensesResponse, IncomeVsExpensesDataPoint
 )
+from utils.serialization import FastJSONResponse
+from utils.downsampling import lttb
 from typing import Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -46,20 +48,52 @@ def get_date_range(period: Optional[str] = None, start: Optional[date] = None, e
     return start_date, end_date
 
 
+def resolve_granularity(granularity: str, start: date, end: date) -> str:
+    """Pick a bucket size for 'auto' so a chart stays around 60 points or fewer."""
+    if granularity != "auto":
+        return granularity
+    days = (end - start).days + 1
+    if days <= 62:
+        return "day"
+    if days <= 366:
+        return "week"
+    return "month"
+
+
+def date_bucket(granularity: str, value):
+    """date_trunc a date column or value to the start of its day/week/month bucket."""
+    # Granularity is validated by callers, so it is safe to inline as a literal; a bound
+    # parameter would make SELECT and GROUP BY expressions differ in Postgres
+    return func.date_trunc(literal_column(f"'{granularity}'"), cast(value, DateTime))
+
+
+def bucket_series(granularity: str, start: date, end: date):
+    """Table of every bucket start between start and end, exposed as column `bucket`."""
+    return func.generate_series(
+        date_bucket(granularity, literal(start)),
+        date_bucket(granularity, literal(end)),
+        cast(literal(f"1 {granularity}"), Interval)
+    ).table_valued("bucket").render_derived(name="series")
+
+
 @router.get("/spending-trends", response_model=SpendingTrendsResponse)
 async def get_spending_trends(
     period: Optional[str] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    granularity: str = Query("day", pattern="^(day|week|month|auto)$"),
+    max_points: Optional[int] = Query(None, ge=3),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get spending trends data."""
+    """Get spending trends bucketed by day, week or month, with empty buckets zero-filled."""
     start, end = get_date_range(period, start_date, end_date)
+    granularity = resolve_granularity(granularity, start, end)
     
-    # Get daily spending
-    transactions = db.query(
-        func.date(Transaction.transaction_date).label("date"),
+    bucket = date_bucket(granularity, Transaction.transaction_date).label("bucket")
+    
+    spending = db.query(
+        bucket,
         func.sum(Transaction.amount).label("total")
     ).filter(
         and_(
@@ -67,14 +101,27 @@ async def get_spending_trends(
             Transaction.transaction_date >= start,
             Transaction.transaction_date <= end
         )
-    ).group_by(func.date(Transaction.transaction_date)).order_by("date").all()
+    ).group_by(bucket).subquery()
+    
+    # Every bucket in the range, so the client gets a gap-free series
+    series = bucket_series(granularity, start, end)
+    
+    rows = db.query(
+        series.c.bucket,
+        func.coalesce(spending.c.total, 0).label("total")
+    ).outerjoin(
+        spending, spending.c.bucket == series.c.bucket
+    ).order_by(series.c.bucket).all()
     
     data_points = [
-        SpendingTrendDataPoint(date=row.date.isoformat(), amount=row.total or Decimal(0))
-        for row in transactions
+        SpendingTrendDataPoint(date=row.bucket.date().isoformat(), amount=row.total)
+        for row in rows
     ]
     
-    return SpendingTrendsResponse(data=data_points, period=period or "custom")
+    if max_points and len(data_points) > max_points:
+        data_points = lttb(data_points, [float(p.amount) for p in data_points], max_points)
+    
+    return SpendingTrendsResponse(data=data_points, period=period or "custom", granularity=granularity)
 
 
 @router.get("/category-breakdown", response_model=CategoryBreakdownResponse)
@@ -83,7 +130,7 @@ async def get_category_breakdown(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get category breakdown."""
     start, end = get_date_range(period, start_date, end_date)
@@ -123,39 +170,55 @@ async def get_income_vs_expenses(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get income vs expenses comparison."""
+    """Get month-by-month income, expenses, savings and cumulative savings."""
     start, end = get_date_range(period, start_date, end_date)
     
-    # Get profile for income
-    profile = db.query(FinancialProfile).filter(
-        FinancialProfile.user_id == current_user.id
-    ).first()
-    
-    monthly_income = Decimal(profile.monthly_income) if profile and profile.monthly_income else Decimal(0)
+    monthly_income = func.coalesce(
+        select(FinancialProfile.monthly_income).where(
+            FinancialProfile.user_id == current_user.id
+        ).scalar_subquery(),
+        0
+    )
     
-    # Calculate number of months
-    months = (end.year - start.year) * 12 + (end.month - start.month) + 1
-    total_income = monthly_income * months
-    
-    # Get total expenses
-    total_expenses = db.query(func.sum(Transaction.amount)).filter(
+    month = date_bucket("month", Transaction.transaction_date).label("bucket")
+    expenses_by_month = db.query(
+        month,
+        func.sum(Transaction.amount).label("total")
+    ).filter(
         and_(
             Transaction.user_id == current_user.id,
             Transaction.transaction_date >= start,
             Transaction.transaction_date <= end
         )
-    ).scalar() or Decimal(0)
+    ).group_by(month).subquery()
     
-    savings = total_income - total_expenses
+    months = bucket_series("month", start, end)
+    expenses = func.coalesce(expenses_by_month.c.total, 0)
+    savings = cast(monthly_income, Numeric) - expenses
     
-    data_points = [IncomeVsExpensesDataPoint(
-        period=period or "custom",
-        income=total_income,
-        expenses=total_expenses,
-        savings=savings
-    )]
+    # One round trip: profile income, grouped monthly expenses and a running savings total
+    rows = db.query(
+        months.c.bucket,
+        monthly_income.label("income"),
+        expenses.label("expenses"),
+        savings.label("savings"),
+        func.sum(savings).over(order_by=months.c.bucket).label("cumulative_savings")
+    ).outerjoin(
+        expenses_by_month, expenses_by_month.c.bucket == months.c.bucket
+    ).order_by(months.c.bucket).all()
+    
+    data_points = [
+        IncomeVsExpensesDataPoint(
+            period=row.bucket.strftime("%Y-%m"),
+            income=row.income,
+            expenses=row.expenses,
+            savings=row.savings,
+            cumulative_savings=row.cumulative_savings
+        )
+        for row in rows
+    ]
     
     return IncomeVsExpensesResponse(data=data_points)
 
@@ -167,12 +230,20 @@ async def export_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_export_db)
 ):
     """Export report as PDF or CSV (simplified - returns JSON for now)."""
     start, end = get_date_range(period, start_date, end_date)
     
-    transactions = db.query(Transaction).filter(
+    # Select only the exported columns, resolving category names in the same query
+    rows = db.query(
+        Transaction.transaction_date,
+        Transaction.amount,
+        Transaction.description,
+        func.coalesce(Category.name, "Uncategorized").label("category")
+    ).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).filter(
         and_(
             Transaction.user_id == current_user.id,
             Transaction.transaction_date >= start,
@@ -182,19 +253,22 @@ async def export_report(
     
     # In a full implementation, this would generate actual CSV/PDF
     # For now, return JSON data
-    return {
+    content = {
         "format": format,
         "period": period or "custom",
         "start_date": start.isoformat(),
         "end_date": end.isoformat(),
         "transactions": [
             {
-                "date": txn.transaction_date.isoformat(),
-                "amount": float(txn.amount),
-                "description": txn.description,
-                "category": db.query(Category).filter(Category.id == txn.category_id).first().name if txn.category_id else "Uncategorized"
+                "date": row.transaction_date.isoformat(),
+                "amount": float(row.amount),
+                "description": row.description,
+                "category": row.category
             }
-            for txn in transactions
+            for row in rows
         ]
     }
-
+    
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
@@ -0,0 +1,161 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, or_
+from database import get_db
+from models.category import Category
+from models.category_rule import CategoryRule
+from models.transaction import Transaction
+from routers.auth import get_current_user
+from models.user import User
+from schemas.rule import CategoryRuleCreate, CategoryRuleUpdate, CategoryRuleResponse, RuleDryRunResponse
+from services.rule_service import rule_engine
+from typing import List
+
+router = APIRouter(prefix="/api/rules", tags=["rules"])
+
+
+def _escape_like(pattern):
+    """Escape LIKE wildcards in a plain string or a SQL string expression."""
+    if isinstance(pattern, str):
+        return pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return func.replace(func.replace(func.replace(pattern, "\\", "\\\\"), "%", "\\%"), "_", "\\_")
+
+
+def _verify_category(db: Session, user_id, category_id):
+    category = db.query(Category).filter(
+        and_(
+            Category.id == category_id,
+            Category.user_id == user_id
+        )
+    ).first()
+    if not category:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found"
+        )
+
+
+def _get_rule(db: Session, user_id, rule_id: str) -> CategoryRule:
+    rule = db.query(CategoryRule).filter(
+        and_(
+            CategoryRule.id == rule_id,
+            CategoryRule.user_id == user_id
+        )
+    ).first()
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rule not found"
+        )
+    return rule
+
+
+@router.get("", response_model=List[CategoryRuleResponse])
+async def get_rules(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get all categorization rules, highest priority first."""
+    return db.query(CategoryRule).filter(
+        CategoryRule.user_id == current_user.id
+    ).order_by(CategoryRule.priority.desc(), CategoryRule.created_at).all()
+
+
+@router.post("", response_model=CategoryRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_rule(
+    rule_data: CategoryRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create a "description contains pattern -> category" rule."""
+    _verify_category(db, current_user.id, rule_data.category_id)
+    
+    rule = CategoryRule(
+        user_id=current_user.id,
+        category_id=rule_data.category_id,
+        pattern=rule_data.pattern,
+        priority=rule_data.priority
+    )
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    rule_engine.invalidate(current_user.id)
+    return rule
+
+
+@router.put("/{rule_id}", response_model=CategoryRuleResponse)
+async def update_rule(
+    rule_id: str,
+    rule_data: CategoryRuleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update a categorization rule."""
+    rule = _get_rule(db, current_user.id, rule_id)
+    
+    if rule_data.category_id is not None:
+        _verify_category(db, current_user.id, rule_data.category_id)
+        rule.category_id = rule_data.category_id
+    if rule_data.pattern is not None:
+        rule.pattern = rule_data.pattern
+    if rule_data.priority is not None:
+        rule.priority = rule_data.priority
+    
+    db.commit()
+    db.refresh(rule)
+    rule_engine.invalidate(current_user.id)
+    return rule
+
+
+@router.delete("/{rule_id}")
+async def delete_rule(
+    rule_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a categorization rule."""
+    rule = _get_rule(db, current_user.id, rule_id)
+    db.delete(rule)
+    db.commit()
+    rule_engine.invalidate(current_user.id)
+    return {"message": "Rule deleted successfully"}
+
+
+@router.post("/dry-run", response_model=RuleDryRunResponse)
+async def dry_run_rule(
+    rule_data: CategoryRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Count existing transactions a rule would match, and how many of them it would move
+    to its category: only uncategorized or auto-categorized ones the rule engine may
+    change, and only where no existing rule of equal or higher priority matches first.
+    """
+    _verify_category(db, current_user.id, rule_data.category_id)
+    
+    # Existing rules win ties: they were created earlier
+    outranked = exists().where(
+        and_(
+            CategoryRule.user_id == current_user.id,
+            CategoryRule.priority >= rule_data.priority,
+            Transaction.description.ilike(
+                func.concat("%", _escape_like(CategoryRule.pattern), "%"), escape="\\"
+            )
+        )
+    )
+    row = db.query(
+        func.count(Transaction.id).label("matched"),
+        func.count(Transaction.id).filter(
+            and_(
+                or_(Transaction.category_id.is_(None), Transaction.category_confidence.isnot(None)),
+                Transaction.category_id.is_distinct_from(rule_data.category_id),
+                ~outranked
+            )
+        ).label("recategorized")
+    ).filter(
+        Transaction.user_id == current_user.id,
+        Transaction.description.ilike(f"%{_escape_like(rule_data.pattern)}%", escape="\\")
+    ).one()
+    
+    return RuleDryRunResponse(matched=row.matched, recategorized=row.recategorized)
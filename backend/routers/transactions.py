@@ -1,24 +1,126 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from database import get_db
-from models.transaction import Transaction
+from sqlalchemy import func, and_, or_, tuple_, text, literal_column, cast, Float, update
+from database import get_db, IS_POSTGRES
+from config import settings
+from models.transaction import Transaction, description_search_vector
 from models.category import Category
 from routers.auth import get_current_user
 from models.user import User
 from schemas.transaction import (
-    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionSummary
+    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionSummary,
+    AutoCategorizeRequest, AutoCategorizeResponse, AutoCategorizeResult,
+    BulkTransactionSelection, BulkTransactionUpdate, BulkTransactionResponse
 )
+from services.categorization_service import categorization_service
+from services.rule_service import rule_engine
+from services.recurring_service import process_transaction_in_background
+from services.budget_service import invalidate_balances
+from utils.serialization import FastJSONResponse, response_columns, rows_to_dicts
+from utils.pagination import encode_cursor, decode_cursor, paginate
 from typing import Optional, List
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from uuid import UUID
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
+TRANSACTION_FIELDS, TRANSACTION_COLUMNS = response_columns(Transaction, TransactionResponse)
+
+# Whether pg_trgm is installed (checked once per process)
+_trigram_available = None
+
+
+def has_trigram_search(db: Session) -> bool:
+    """Whether fuzzy (trigram) description matching is available."""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = IS_POSTGRES and db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+    return _trigram_available
+
+
+def search_condition(db: Session, q: str):
+    """
+    Condition matching transactions whose description matches a search query.
+    Postgres uses the full-text GIN index, plus the trigram index for fuzzy matches;
+    other databases fall back to a case-insensitive substring match.
+    """
+    if not IS_POSTGRES:
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return Transaction.description.ilike(f"%{escaped}%", escape="\\")
+    
+    ts_query = func.websearch_to_tsquery(literal_column("'english'"), q)
+    condition = description_search_vector.op("@@")(ts_query)
+    if has_trigram_search(db):
+        condition = or_(condition, Transaction.description.op("%>")(q))
+    return condition
+
+
+def search_rank(db: Session, q: str):
+    """Relevance score for a search query, or None when ranking is unavailable."""
+    if not IS_POSTGRES:
+        return None
+    
+    ts_query = func.websearch_to_tsquery(literal_column("'english'"), q)
+    rank = func.ts_rank(description_search_vector, ts_query)
+    if has_trigram_search(db):
+        rank = rank + func.word_similarity(q, Transaction.description)
+    # Double precision so the value round-trips exactly through a pagination cursor
+    return cast(rank, Float)
+
+
+def suggest_category(
+    db: Session,
+    user_id,
+    description: Optional[str],
+    payment_method: Optional[str],
+    amount,
+    use_model: bool = True
+):
+    """
+    Suggest a category for an uncategorized transaction as (category_id, confidence).
+    A matching user rule wins with confidence 1.0; otherwise the local model predicts.
+    """
+    category_id = rule_engine.match(db, user_id, description)
+    if category_id is not None:
+        return category_id, 1.0
+    if not use_model:
+        return None, 0.0
+    return categorization_service.predict(db, user_id, description, payment_method, amount)
+
+
+def filter_transactions(
+    query,
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id=None,
+    q: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+):
+    """Apply the transaction list filters to a query already scoped to a user."""
+    if start_date:
+        query = query.filter(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.transaction_date <= end_date)
+    if category_id:
+        query = query.filter(Transaction.category_id == category_id)
+    if min_amount is not None:
+        query = query.filter(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(Transaction.amount <= max_amount)
+    if q:
+        query = query.filter(search_condition(db, q))
+    return query
+
 
 @router.post("", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -37,9 +139,25 @@ async def create_transaction(
                 detail="Category not found"
             )
     
+    # Suggest a category from the user's rules or history when none was picked
+    category_id = transaction_data.category_id
+    category_confidence = None
+    if category_id is None:
+        suggested_id, confidence = suggest_category(
+            db, current_user.id,
+            transaction_data.description,
+            transaction_data.payment_method,
+            transaction_data.amount,
+            use_model=settings.AUTO_CATEGORIZE_ENABLED
+        )
+        if suggested_id and confidence >= settings.AUTO_CATEGORIZE_MIN_CONFIDENCE:
+            category_id = suggested_id
+            category_confidence = confidence
+    
     transaction = Transaction(
         user_id=current_user.id,
-        category_id=transaction_data.category_id,
+        category_id=category_id,
+        category_confidence=category_confidence,
         amount=transaction_data.amount,
         description=transaction_data.description,
         transaction_date=transaction_data.transaction_date,
@@ -49,35 +167,232 @@ async def create_transaction(
     )
     
     db.add(transaction)
+    invalidate_balances(db, current_user.id, [category_id], transaction.transaction_date)
     db.commit()
     db.refresh(transaction)
+    
+    if transaction_data.category_id:
+        categorization_service.learn(
+            current_user.id, transaction.description, transaction.payment_method,
+            transaction.amount, transaction.category_id
+        )
+    
+    # Recurring detection runs after the response is sent
+    background_tasks.add_task(process_transaction_in_background, current_user.id, transaction.id)
     return transaction
 
 
+@router.post("/auto-categorize", response_model=AutoCategorizeResponse)
+async def auto_categorize_transactions(
+    request: AutoCategorizeRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Categorize uncategorized transactions with the user's rules and local model.
+    Suggestions at or above the confidence threshold are applied in one bulk update
+    unless dry_run is set; every suggestion is returned with its confidence.
+    """
+    min_confidence = request.min_confidence
+    if min_confidence is None:
+        min_confidence = settings.AUTO_CATEGORIZE_MIN_CONFIDENCE
+    
+    rows = db.query(
+        Transaction.id,
+        Transaction.description,
+        Transaction.payment_method,
+        Transaction.amount,
+        Transaction.transaction_date
+    ).filter(
+        Transaction.user_id == current_user.id,
+        Transaction.category_id.is_(None)
+    ).order_by(Transaction.transaction_date.desc()).limit(request.limit).all()
+    
+    results = []
+    for row in rows:
+        category_id, confidence = suggest_category(
+            db, current_user.id, row.description, row.payment_method, row.amount
+        )
+        if category_id is None:
+            continue
+        results.append(AutoCategorizeResult(
+            transaction_id=row.id,
+            category_id=category_id,
+            confidence=confidence,
+            applied=not request.dry_run and confidence >= min_confidence
+        ))
+    
+    updates = [
+        {"id": result.transaction_id, "category_id": result.category_id, "category_confidence": result.confidence}
+        for result in results if result.applied
+    ]
+    if updates:
+        db.execute(update(Transaction), updates)
+        applied_dates = {row.id: row.transaction_date for row in rows}
+        invalidate_balances(
+            db, current_user.id,
+            {update_row["category_id"] for update_row in updates},
+            min(applied_dates[update_row["id"]] for update_row in updates)
+        )
+        db.commit()
+    
+    return AutoCategorizeResponse(processed=len(rows), categorized=len(updates), results=results)
+
+
+def select_transactions(db: Session, user_id, selection: BulkTransactionSelection):
+    """Query for the transactions a bulk request targets, by ids or by filter."""
+    if (selection.ids is None) == (selection.filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either ids or filter"
+        )
+    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+    if selection.ids is not None:
+        return query.filter(Transaction.id.in_(selection.ids))
+    return filter_transactions(query, db, **selection.filter.model_dump())
+
+
+def invalidate_selection_balances(db: Session, user_id, query, extra_category_id=None):
+    """Invalidate budget periods touched by a bulk change, from one grouped query."""
+    touched = query.with_entities(
+        Transaction.category_id,
+        func.min(Transaction.transaction_date)
+    ).group_by(Transaction.category_id).order_by(None).all()
+    if touched:
+        invalidate_balances(
+            db, user_id,
+            {category_id for category_id, _ in touched} | {extra_category_id},
+            min(earliest for _, earliest in touched)
+        )
+
+
+@router.patch("/bulk", response_model=BulkTransactionResponse)
+async def bulk_update_transactions(
+    request: BulkTransactionUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update many transactions with one set-based UPDATE."""
+    values = {}
+    if request.category_id is not None:
+        category = db.query(Category).filter(
+            and_(
+                Category.id == request.category_id,
+                Category.user_id == current_user.id
+            )
+        ).first()
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+        values["category_id"] = request.category_id
+        values["category_confidence"] = None  # Confirmed by the user
+    if request.payment_method is not None:
+        values["payment_method"] = request.payment_method
+    if request.is_recurring is not None:
+        values["is_recurring"] = request.is_recurring
+    
+    query = select_transactions(db, current_user.id, request)
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    if "category_id" in values:
+        invalidate_selection_balances(db, current_user.id, query, request.category_id)
+    affected = query.update(values, synchronize_session=False)
+    db.commit()
+    
+    if "category_id" in values and affected:
+        # Learned counts no longer match history; retrain on next use
+        categorization_service.invalidate(current_user.id)
+    return BulkTransactionResponse(affected=affected)
+
+
+@router.delete("/bulk", response_model=BulkTransactionResponse)
+async def bulk_delete_transactions(
+    request: BulkTransactionSelection,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete many transactions with one set-based DELETE."""
+    query = select_transactions(db, current_user.id, request)
+    invalidate_selection_balances(db, current_user.id, query)
+    affected = query.delete(synchronize_session=False)
+    db.commit()
+    
+    if affected:
+        categorization_service.invalidate(current_user.id)
+    return BulkTransactionResponse(affected=affected)
+
+
 @router.get("", response_model=List[TransactionResponse])
 async def get_transactions(
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     category_id: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions with optional filters."""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+    """
+    Get transactions with optional filters and description search.
+    Results are ordered by relevance when searching, otherwise by date. When there are
+    more results, the X-Next-Cursor header holds a cursor for the next page
+    (keyset pagination; `offset` is ignored when a cursor is given).
+    """
+    query = filter_transactions(
+        db.query(Transaction).filter(Transaction.user_id == current_user.id),
+        db, start_date, end_date, category_id, q, min_amount, max_amount
+    )
     
-    if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
-    if category_id:
-        query = query.filter(Transaction.category_id == category_id)
+    rank = search_rank(db, q) if q else None
+    if rank is not None:
+        sort_keys = [rank, Transaction.id]
+        parsers = [float, UUID]
+    else:
+        sort_keys = [Transaction.transaction_date, Transaction.id]
+        parsers = [date.fromisoformat, UUID]
     
-    query = query.order_by(Transaction.transaction_date.desc())
-    transactions = query.offset(offset).limit(limit).all()
+    if cursor:
+        values = decode_cursor(cursor, len(sort_keys))
+        try:
+            values = [parse(value) for parse, value in zip(parsers, values)]
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    else:
+        values = None
+    
+    # Fetch one extra row to learn whether another page exists
+    query = paginate(query, sort_keys, limit, after=values, offset=offset)
+    
+    if settings.FAST_JSON_RESPONSES:
+        # Fast path: fetch plain column tuples and skip response_model re-validation
+        rows = query.with_entities(*TRANSACTION_COLUMNS, *sort_keys).all()
+        items = rows_to_dicts(TRANSACTION_FIELDS, (row[:len(TRANSACTION_COLUMNS)] for row in rows[:limit]))
+    else:
+        rows = query.add_columns(*sort_keys).all()
+        items = [row[0] for row in rows[:limit]]
+    
+    headers = {}
+    if len(rows) > limit:
+        headers["X-Next-Cursor"] = encode_cursor(list(rows[limit - 1][-len(sort_keys):]))
     
-    return transactions
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(items, headers=headers)
+    response.headers.update(headers)
+    return items
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
@@ -138,11 +453,20 @@ async def update_transaction(
                 detail="Category not found"
             )
     
+    # Learned features before the update, so the model can be corrected afterwards
+    previous = (
+        transaction.description, transaction.payment_method, transaction.amount,
+        transaction.category_id if transaction.category_confidence is None else None
+    )
+    previous_category_id = transaction.category_id
+    previous_date = transaction.transaction_date
+    
     # Update fields
     if transaction_data.amount is not None:
         transaction.amount = transaction_data.amount
     if transaction_data.category_id is not None:
         transaction.category_id = transaction_data.category_id
+        transaction.category_confidence = None  # Confirmed by the user
     if transaction_data.description is not None:
         transaction.description = transaction_data.description
     if transaction_data.transaction_date is not None:
@@ -154,8 +478,31 @@ async def update_transaction(
     if transaction_data.receipt_url is not None:
         transaction.receipt_url = transaction_data.receipt_url
     
+    # Re-apply rules to a new description unless the user chose the category
+    if (
+        transaction_data.description is not None
+        and transaction_data.category_id is None
+        and (transaction.category_id is None or transaction.category_confidence is not None)
+    ):
+        rule_category_id = rule_engine.match(db, current_user.id, transaction.description)
+        if rule_category_id is not None:
+            transaction.category_id = rule_category_id
+            transaction.category_confidence = 1.0
+    
+    invalidate_balances(
+        db, current_user.id,
+        {previous_category_id, transaction.category_id},
+        min(previous_date, transaction.transaction_date)
+    )
     db.commit()
     db.refresh(transaction)
+    
+    categorization_service.forget(current_user.id, *previous)
+    if transaction.category_confidence is None:
+        categorization_service.learn(
+            current_user.id, transaction.description, transaction.payment_method,
+            transaction.amount, transaction.category_id
+        )
     return transaction
 
 
@@ -180,44 +527,53 @@ async def delete_transaction(
         )
     
     db.delete(transaction)
+    invalidate_balances(db, current_user.id, [transaction.category_id], transaction.transaction_date)
     db.commit()
+    
+    if transaction.category_confidence is None:
+        categorization_service.forget(
+            current_user.id, transaction.description, transaction.payment_method,
+            transaction.amount, transaction.category_id
+        )
     return {"message": "Transaction deleted successfully"}
 
 
-@router.get("/summary/summary", response_model=TransactionSummary)
-async def get_transaction_summary(
-    start_date: Optional[date] = Query(None),
-    end_date: Optional[date] = Query(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get spending summary for a period."""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+def build_transaction_summary(
+    db: Session,
+    user_id,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> TransactionSummary:
+    """
+    Total, count and per-category totals for a date window in a single query.
+    GROUPING SETS yields one row per category plus a grand-total row.
+    """
+    query = db.query(
+        func.grouping(Category.name).label("is_total"),
+        Category.name,
+        func.count(Transaction.id).label("count"),
+        func.sum(Transaction.amount).label("total")
+    ).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).filter(Transaction.user_id == user_id)
     
     if start_date:
         query = query.filter(Transaction.transaction_date >= start_date)
     if end_date:
         query = query.filter(Transaction.transaction_date <= end_date)
     
-    # Total spent
-    total_spent = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user.id
-    ).scalar() or Decimal(0)
+    rows = query.group_by(func.grouping_sets(Category.name, tuple_())).all()
     
-    # Total transactions
-    total_transactions = query.count()
-    
-    # Category breakdown
-    category_breakdown = db.query(
-        Category.name,
-        func.sum(Transaction.amount).label("total")
-    ).join(
-        Transaction, Transaction.category_id == Category.id
-    ).filter(
-        Transaction.user_id == current_user.id
-    ).group_by(Category.name).all()
-    
-    breakdown_dict = {cat: float(total) for cat, total in category_breakdown}
+    total_spent = Decimal(0)
+    total_transactions = 0
+    breakdown_dict = {}
+    for row in rows:
+        if row.is_total:
+            total_spent = row.total or Decimal(0)
+            total_transactions = row.count
+        else:
+            # A NULL category name in a per-category row means no category
+            breakdown_dict[row.name or "Uncategorized"] = float(row.total)
     
     return TransactionSummary(
         total_spent=total_spent,
@@ -225,3 +581,13 @@ async def get_transaction_summary(
         category_breakdown=breakdown_dict
     )
 
+
+@router.get("/summary/summary", response_model=TransactionSummary)
+async def get_transaction_summary(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get spending summary for a period."""
+    return build_transaction_summary(db, current_user.id, start_date, end_date)
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
 from database import get_db
+from config import settings
 from models.user import User, FinancialProfile
 from schemas.user import (
     UserProfileResponse, UserProfileUpdate, FinancialProfileCreate,
     FinancialProfileResponse, PasswordUpdate
 )
-from routers.auth import get_current_user
+from routers.auth import get_current_user, get_export_db
 from utils.security import verify_password, get_password_hash
 from utils.validators import validate_email, validate_phone
+from utils.serialization import FastJSONResponse
+from services.account_service import mark_deleted, purge_user
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -86,7 +89,7 @@ async def update_password(
 @router.get("/export-data")
 async def export_user_data(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_export_db)
 ):
     """Export all user data as JSON."""
     from models.category import Category
@@ -102,12 +105,20 @@ async def export_user_data(
     
     categories = db.query(Category).filter(Category.user_id == current_user.id).all()
     budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
-    transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
+    transactions = db.query(
+        Transaction.id,
+        Transaction.category_id,
+        Transaction.amount,
+        Transaction.description,
+        Transaction.transaction_date,
+        Transaction.payment_method,
+        Transaction.is_recurring
+    ).filter(Transaction.user_id == current_user.id).all()
     life_events = db.query(LifeEvent).filter(LifeEvent.user_id == current_user.id).all()
     insights = db.query(AIInsight).filter(AIInsight.user_id == current_user.id).all()
     alerts = db.query(Alert).filter(Alert.user_id == current_user.id).all()
     
-    return {
+    content = {
         "user": {
             "username": current_user.username,
             "full_name": current_user.full_name,
@@ -184,6 +195,10 @@ async def export_user_data(
         ],
         "exported_at": datetime.utcnow().isoformat(),
     }
+    
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
 
 
 @router.get("/financial-profile", response_model=FinancialProfileResponse)
@@ -240,11 +255,12 @@ async def update_financial_profile(
 
 @router.delete("/account")
 async def delete_account(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Delete user account and all associated data."""
-    db.delete(current_user)
-    db.commit()
+    """Delete user account; associated data is purged in the background."""
+    mark_deleted(db, current_user)
+    background_tasks.add_task(purge_user, current_user.id)
     return {"message": "Account deleted successfully"}
 
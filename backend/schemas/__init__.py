@@ -6,4 +6,7 @@ from .category import *
 from .ai import *
 from .alert import *
 from .report import *
-
+from .rule import *
+from .recurring import *
+from .admin import *
+from .dashboard import *
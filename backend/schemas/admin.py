@@ -0,0 +1,55 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from schemas.auth import RegisterRequest
+
+
+class ProvisionUser(RegisterRequest):
+    monthly_income: Optional[Decimal] = Field(None, ge=0)
+    current_savings: Optional[Decimal] = None
+    currency: str = Field("USD", min_length=3, max_length=3)
+
+
+class ProvisionUsersRequest(BaseModel):
+    users: list[ProvisionUser] = Field(..., min_length=1, max_length=10000)
+
+
+class ProvisionSkipped(BaseModel):
+    username: str
+    email: str
+    reason: str
+
+
+class ProvisionUsersResponse(BaseModel):
+    created: int
+    skipped: list[ProvisionSkipped]
+
+
+class AIUsageBreakdown(BaseModel):
+    provider: str
+    model: Optional[str]
+    outcome: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    avg_latency_ms: float
+    p95_latency_ms: float
+    estimated_cost: Decimal
+
+
+class AIUsageUser(BaseModel):
+    user_id: UUID
+    username: str
+    calls: int
+    tokens: int
+    estimated_cost: Decimal
+
+
+class AIUsageSummaryResponse(BaseModel):
+    since: datetime
+    total_calls: int
+    total_cost: Decimal
+    breakdown: list[AIUsageBreakdown]
+    top_users: list[AIUsageUser]
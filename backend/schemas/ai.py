@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
 
@@ -10,7 +10,7 @@ class AIAnalysisRequest(BaseModel):
 
 
 class BudgetRecommendation(BaseModel):
-    category_id: UUID
+    category_id: Optional[UUID] = None
     category_name: str
     recommended_limit: Decimal
     reasoning: str
@@ -31,14 +31,33 @@ class LifeEventRequest(BaseModel):
 class LifeEventResponse(BaseModel):
     id: UUID
     event_type: str
-    event_date: str
+    event_date: date
     description: Optional[str]
+    adjustment_status: str = "pending"  # Budget proposals are computed in the background
     created_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class BudgetAdjustmentProposalResponse(BaseModel):
+    id: UUID
+    budget_id: UUID
+    category_id: UUID
+    category_name: str
+    current_limit: Decimal
+    proposed_limit: Decimal
+    adjustment_percentage: Optional[Decimal]
+    reasoning: Optional[str]
+    status: str
+    created_at: datetime
+
+
+class LifeEventProposalsResponse(BaseModel):
+    event: LifeEventResponse
+    proposals: list[BudgetAdjustmentProposalResponse]
+
+
 class AIInsightResponse(BaseModel):
     id: UUID
     insight_type: Optional[str]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
 
@@ -8,16 +8,26 @@ from decimal import Decimal
 class BudgetCreate(BaseModel):
     category_id: UUID
     monthly_limit: Decimal = Field(..., gt=0)
-    budget_period: str = "monthly"
+    budget_period: str = Field("monthly", pattern="^(weekly|monthly|quarterly|yearly)$")
     rollover_enabled: bool = False
 
 
 class BudgetUpdate(BaseModel):
     monthly_limit: Optional[Decimal] = Field(None, gt=0)
-    budget_period: Optional[str] = None
+    budget_period: Optional[str] = Field(None, pattern="^(weekly|monthly|quarterly|yearly)$")
     rollover_enabled: Optional[bool] = None
 
 
+class BudgetLimitUpdate(BaseModel):
+    budget_id: UUID
+    monthly_limit: Decimal = Field(..., gt=0)
+
+
+class BulkBudgetUpdate(BaseModel):
+    updates: list[BudgetLimitUpdate] = Field(default_factory=list, max_length=500)
+    proposal_ids: list[UUID] = Field(default_factory=list, max_length=500)  # Applied at their proposed limit unless overridden in updates
+
+
 class BudgetResponse(BaseModel):
     id: UUID
     user_id: UUID
@@ -38,6 +48,10 @@ class BudgetStatusResponse(BaseModel):
     spent: Decimal
     remaining: Decimal
     percentage_used: float
+    budget_period: str = "monthly"
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None  # Last day of the current period
+    rollover_amount: Decimal = Decimal(0)  # Carried in from earlier periods
 
 
 class BudgetTemplateCreate(BaseModel):
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from datetime import date
+from schemas.budget import BudgetStatusResponse
+from schemas.transaction import TransactionSummary
+from schemas.alert import AlertResponse
+from schemas.ai import AIInsightResponse
+
+
+class DashboardResponse(BaseModel):
+    month_start: date
+    budget_status: list[BudgetStatusResponse]
+    summary: TransactionSummary  # Current month to date
+    alerts: list[AlertResponse]  # Most recent unread alerts
+    unread_alert_count: int
+    insights: list[AIInsightResponse]
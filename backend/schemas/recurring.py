@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+
+class RecurringSeriesResponse(BaseModel):
+    id: UUID
+    category_id: Optional[UUID]
+    merchant_key: str
+    description: Optional[str]
+    average_amount: Decimal
+    cadence: str
+    occurrence_count: int
+    first_date: date
+    last_date: date
+    next_expected_date: date
+    is_active: bool
+    
+    class Config:
+        from_attributes = True
+
+
+class UpcomingChargeResponse(BaseModel):
+    series_id: UUID
+    description: Optional[str]
+    cadence: str
+    due_date: date
+    amount: Decimal
+
+
+class BillReminderResponse(BaseModel):
+    created: int
@@ -18,6 +18,7 @@ class SpendingTrendDataPoint(BaseModel):
 class SpendingTrendsResponse(BaseModel):
     data: list[SpendingTrendDataPoint]
     period: str
+    granularity: str = "day"  # "day", "week" or "month"
 
 
 class CategoryBreakdownItem(BaseModel):
@@ -32,10 +33,11 @@ class CategoryBreakdownResponse(BaseModel):
 
 
 class IncomeVsExpensesDataPoint(BaseModel):
-    period: str
+    period: str  # "YYYY-MM"
     income: Decimal
     expenses: Decimal
     savings: Decimal
+    cumulative_savings: Decimal
 
 
 class IncomeVsExpensesResponse(BaseModel):
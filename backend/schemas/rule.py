@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class CategoryRuleCreate(BaseModel):
+    category_id: UUID
+    pattern: str = Field(..., min_length=1, max_length=100)
+    priority: int = 0
+
+
+class CategoryRuleUpdate(BaseModel):
+    category_id: Optional[UUID] = None
+    pattern: Optional[str] = Field(None, min_length=1, max_length=100)
+    priority: Optional[int] = None
+
+
+class CategoryRuleResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    category_id: UUID
+    pattern: str
+    priority: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class RuleDryRunResponse(BaseModel):
+    matched: int
+    recategorized: int
@@ -29,6 +29,7 @@ class TransactionResponse(BaseModel):
     id: UUID
     user_id: UUID
     category_id: Optional[UUID]
+    category_confidence: Optional[float] = None
     amount: Decimal
     description: Optional[str]
     transaction_date: date
@@ -46,3 +47,47 @@ class TransactionSummary(BaseModel):
     total_transactions: int
     category_breakdown: dict[str, Decimal]
 
+
+
+class AutoCategorizeRequest(BaseModel):
+    limit: int = Field(500, ge=1, le=5000)
+    min_confidence: Optional[float] = Field(None, ge=0, le=1)
+    dry_run: bool = False
+
+
+class AutoCategorizeResult(BaseModel):
+    transaction_id: UUID
+    category_id: UUID
+    confidence: float
+    applied: bool
+
+
+class AutoCategorizeResponse(BaseModel):
+    processed: int
+    categorized: int
+    results: list[AutoCategorizeResult]
+
+
+class TransactionFilter(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    category_id: Optional[UUID] = None
+    q: Optional[str] = Field(None, min_length=1, max_length=200)
+    min_amount: Optional[Decimal] = Field(None, ge=0)
+    max_amount: Optional[Decimal] = Field(None, ge=0)
+
+
+class BulkTransactionSelection(BaseModel):
+    """Either explicit ids or a filter; exactly one must be given."""
+    ids: Optional[list[UUID]] = Field(None, min_length=1, max_length=5000)
+    filter: Optional[TransactionFilter] = None
+
+
+class BulkTransactionUpdate(BulkTransactionSelection):
+    category_id: Optional[UUID] = None
+    payment_method: Optional[str] = None
+    is_recurring: Optional[bool] = None
+
+
+class BulkTransactionResponse(BaseModel):
+    affected: int
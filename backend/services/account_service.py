@@ -0,0 +1,78 @@
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from database import Base, SessionLocal
+from config import settings
+import models  # noqa: F401 - registers every user-owned table on Base.metadata
+from models.user import User
+from services.categorization_service import categorization_service
+from services.rule_service import rule_engine
+from services.answer_cache import answer_cache
+from services.snapshot_service import snapshot_cache
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+def _user_owned_tables():
+    """Tables with a user_id column, children before parents."""
+    return [
+        table for table in reversed(Base.metadata.sorted_tables)
+        if "user_id" in table.c and table.name != User.__tablename__
+    ]
+
+
+def mark_deleted(db, user: User):
+    """Hide the account immediately; its data is purged by purge_user."""
+    user.deleted_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+@tracer.traced("account.purge_user")
+def purge_user(user_id, batch_size: int = None):
+    """
+    Delete a deleted account's rows in bounded batches, committing after each batch so
+    no statement holds locks on a large account for long. Tables without a user_id
+    column (e.g. budget period balances) go with their parents via ON DELETE CASCADE.
+    """
+    batch_size = batch_size or settings.ACCOUNT_PURGE_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        for table in _user_owned_tables():
+            key = table.primary_key.columns[0]  # id, or user_id for one-row-per-user tables
+            while True:
+                batch = select(key).where(table.c.user_id == user_id).limit(batch_size)
+                deleted = db.execute(delete(table).where(key.in_(batch))).rowcount
+                db.commit()
+                if deleted < batch_size:
+                    break
+        
+        db.execute(delete(User.__table__).where(User.__table__.c.id == user_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        # The account stays marked deleted; purge_deleted_users retries it
+        logger.exception("Purge of user %s failed", user_id)
+        raise
+    finally:
+        db.close()
+    
+    categorization_service.invalidate(user_id)
+    rule_engine.invalidate(user_id)
+    answer_cache.invalidate(user_id)
+    snapshot_cache.invalidate(user_id)
+
+
+def purge_deleted_users() -> int:
+    """Purge every account marked deleted, e.g. after a purge was interrupted."""
+    db = SessionLocal()
+    try:
+        user_ids = [
+            row.id for row in db.query(User.id).filter(User.deleted_at.isnot(None)).all()
+        ]
+    finally:
+        db.close()
+    
+    for user_id in user_ids:
+        purge_user(user_id)
+    return len(user_ids)
@@ -0,0 +1,276 @@
+"""
+Latency-aware routing across several AI provider/model backends.
+
+Each backend keeps an exponentially weighted moving average of its latency and error
+rate. A call goes to the best-scoring healthy backend; if it has not answered after
+AI_HEDGE_AFTER_MS a second backend is raced against it, and a failed attempt fails
+over to the next backend. Backends that keep failing are skipped for a cooldown.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from config import settings
+from services.ai_usage_service import ai_usage_recorder
+from utils.tracing import tracer, set_span_attribute, CLIENT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = {
+    "openai": "gpt-4",
+    "anthropic": "claude-3-opus-20240229",
+}
+EWMA_ALPHA = 0.2
+EXPLORE_RATE = 0.05  # Share of calls sent to a random healthy backend so its stats stay current
+FAILURES_BEFORE_COOLDOWN = 3
+
+
+class AIParseError(ValueError):
+    """The provider answered but the response could not be parsed."""
+
+
+@dataclass
+class AIRequest:
+    operation: str
+    prompt: str
+    system: Optional[str] = None
+    temperature: float = 0.7
+    max_tokens: int = 1000
+    json_mode: bool = False
+    parse: Optional[Callable[[str], Any]] = None
+    user_id: Any = None
+
+
+@dataclass
+class Backend:
+    provider: str
+    model: str
+    latency_ewma: Optional[float] = None  # Seconds
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    calls: int = 0
+    _client: Any = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+    
+    @property
+    def client(self):
+        """Provider SDK client, imported and constructed on first use to keep startup fast."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    timeout = settings.AI_REQUEST_TIMEOUT_SECONDS
+                    if self.provider == "openai":
+                        import openai
+                        self._client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, timeout=timeout)
+                    else:
+                        import anthropic
+                        self._client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY, timeout=timeout)
+        return self._client
+    
+    def healthy(self, now: float) -> bool:
+        return self.cooldown_until <= now
+    
+    def score(self) -> float:
+        # Unmeasured backends score best so each one gets tried
+        if self.latency_ewma is None:
+            return 0.0
+        return self.latency_ewma / max(0.05, 1.0 - self.error_rate)
+    
+    def observe(self, latency: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            if ok or self.latency_ewma is None:
+                self.latency_ewma = latency if self.latency_ewma is None else (
+                    EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+                )
+            self.error_rate = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+            if ok:
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+                    self.cooldown_until = time.monotonic() + settings.AI_BACKEND_COOLDOWN_SECONDS
+    
+    def complete(self, request: AIRequest) -> tuple:
+        """Call the provider; returns (text, prompt_tokens, completion_tokens)."""
+        if self.provider == "openai":
+            messages = [{"role": "user", "content": request.prompt}]
+            if request.system:
+                messages.insert(0, {"role": "system", "content": request.system})
+            kwargs = {"response_format": {"type": "json_object"}} if request.json_mode else {}
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=request.temperature,
+                **kwargs
+            )
+            usage = response.usage
+            return (
+                response.choices[0].message.content,
+                getattr(usage, "prompt_tokens", 0) or 0,
+                getattr(usage, "completion_tokens", 0) or 0,
+            )
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=request.max_tokens,
+            messages=[
+                {"role": "user", "content": request.prompt}
+            ]
+        )
+        usage = response.usage
+        return (
+            response.content[0].text,
+            getattr(usage, "input_tokens", 0) or 0,
+            getattr(usage, "output_tokens", 0) or 0,
+        )
+    
+    def snapshot(self, now: float) -> dict:
+        return {
+            "backend": self.name,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "healthy": self.healthy(now),
+        }
+
+
+def parse_backends(spec: str) -> List[Backend]:
+    """Parse "provider:model, ..." keeping only providers with an API key configured."""
+    keys = {"openai": settings.OPENAI_API_KEY, "anthropic": settings.ANTHROPIC_API_KEY}
+    backends = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        provider, _, model = item.partition(":")
+        provider = provider.strip().lower()
+        if provider not in keys:
+            raise ValueError(f"Unknown AI provider in {item!r}")
+        if keys[provider]:
+            backends.append(Backend(provider, model.strip() or DEFAULT_MODELS[provider]))
+    return backends
+
+
+class AIRouter:
+    def __init__(self, tiers: Dict[str, List[Backend]], hedge_after: Optional[float] = None, max_workers: int = 16):
+        self.tiers = {tier: backends for tier, backends in tiers.items() if backends}
+        self.hedge_after = hedge_after
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "AIRouter":
+        spec = settings.AI_BACKENDS
+        if not spec and settings.AI_PROVIDER in DEFAULT_MODELS:
+            # Single-provider configuration from before routing existed
+            spec = f"{settings.AI_PROVIDER}:{DEFAULT_MODELS[settings.AI_PROVIDER]}"
+        tiers = {"default": parse_backends(spec), "fast": parse_backends(settings.AI_FAST_BACKENDS)}
+        hedge_after = settings.AI_HEDGE_AFTER_MS / 1000 if settings.AI_HEDGE_AFTER_MS > 0 else None
+        return cls(tiers, hedge_after, settings.AI_ROUTER_WORKERS)
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tiers)
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai-router")
+        return self._executor
+    
+    def candidates(self, tier: str = "default") -> List[Backend]:
+        """Backends in the order they should be tried: healthy ones by score, then cooling down ones."""
+        backends = self.tiers.get(tier) or self.tiers.get("default") or []
+        now = time.monotonic()
+        healthy = sorted((b for b in backends if b.healthy(now)), key=Backend.score)
+        cooling = sorted((b for b in backends if not b.healthy(now)), key=lambda b: b.cooldown_until)
+        if len(healthy) > 1 and random.random() < EXPLORE_RATE:
+            healthy.insert(0, healthy.pop(random.randrange(1, len(healthy))))
+        return healthy + cooling
+    
+    def _attempt(self, backend: Backend, request: AIRequest, hedged: bool) -> Any:
+        prompt_tokens = completion_tokens = 0
+        outcome = "success"
+        start = time.perf_counter()
+        attributes = {"ai.provider": backend.provider, "ai.model": backend.model, "ai.operation": request.operation, "ai.hedge": hedged}
+        with tracer.start_span("ai.provider_call", CLIENT, attributes):
+            try:
+                text, prompt_tokens, completion_tokens = backend.complete(request)
+                if request.parse is None:
+                    return text
+                try:
+                    return request.parse(text)
+                except Exception as e:
+                    outcome = "parse_error"
+                    raise AIParseError(str(e)) from e
+            except AIParseError:
+                raise
+            except Exception as e:
+                outcome = "timeout" if "timeout" in type(e).__name__.lower() else "error"
+                raise
+            finally:
+                latency = time.perf_counter() - start
+                backend.observe(latency, outcome == "success")
+                set_span_attribute("ai.outcome", outcome)
+                ai_usage_recorder.record(
+                    user_id=request.user_id,
+                    operation=request.operation,
+                    provider=backend.provider,
+                    model=backend.model,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    latency_ms=latency * 1000,
+                    outcome=outcome
+                )
+    
+    def _submit(self, backend: Backend, request: AIRequest, hedged: bool) -> Future:
+        # Run in a copy of the caller's context so provider spans nest under the request
+        context = contextvars.copy_context()
+        return self.executor.submit(context.run, self._attempt, backend, request, hedged)
+    
+    def call(self, request: AIRequest, tier: str = "default") -> Any:
+        """
+        Return the first successful (parsed) response. A slow primary is hedged with the
+        next backend; failures fail over until every backend has been tried.
+        """
+        candidates = self.candidates(tier)
+        if not candidates:
+            raise RuntimeError("No AI backend is configured")
+        if len(candidates) == 1:
+            return self._attempt(candidates[0], request, False)
+        
+        pending = {self._submit(candidates[0], request, False)}
+        remaining = candidates[1:]
+        last_error: Optional[BaseException] = None
+        while pending:
+            hedge = self.hedge_after is not None and bool(remaining) and len(pending) == 1
+            done, pending = wait(pending, timeout=self.hedge_after if hedge else None, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slow: race the next backend; the slower answer is discarded
+                set_span_attribute("ai.hedged", True)
+                pending.add(self._submit(remaining.pop(0), request, True))
+                continue
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+            if not pending and remaining:
+                pending.add(self._submit(remaining.pop(0), request, False))
+        raise last_error
+    
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {tier: [backend.snapshot(now) for backend in backends] for tier, backends in self.tiers.items()}
+
+
+ai_router = AIRouter.from_settings()
@@ -1,25 +1,56 @@
 import json
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from decimal import Decimal
 from datetime import datetime, timedelta
-from config import settings
 from schemas.ai import BudgetRecommendation, AIAnalysisResponse
-import openai
-import anthropic
+from services.ai_router import ai_router, AIRequest
+from services.ai_usage_service import ai_usage_recorder
+from services.answer_cache import answer_cache
+from utils.tracing import tracer, set_span_attribute
 
 
 class AIService:
-    def __init__(self):
-        if settings.AI_PROVIDER == "openai" and settings.OPENAI_API_KEY:
-            openai.api_key = settings.OPENAI_API_KEY
-            self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.provider = "openai"
-        elif settings.AI_PROVIDER == "anthropic" and settings.ANTHROPIC_API_KEY:
-            self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            self.provider = "anthropic"
-        else:
-            self.client = None
-            self.provider = None
+    def __init__(self, router=None):
+        self.router = router or ai_router
+    
+    def _call_provider(
+        self,
+        operation: str,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False,
+        parse: Optional[Callable[[str], Any]] = None,
+        user_id=None,
+        tier: str = "default"
+    ) -> Any:
+        """
+        Single entry point for provider calls, routed to the fastest healthy backend.
+        Every attempt records provider, model, tokens, latency and outcome; raises when
+        all backends time out, fail or return unparseable output so callers can fall back.
+        """
+        request = AIRequest(operation, prompt, system, temperature, max_tokens, json_mode, parse, user_id)
+        return self.router.call(request, tier)
+    
+    def _record_fallback(self, operation: str, user_id=None):
+        """Record a call answered by the rule-based fallback because no provider is configured."""
+        ai_usage_recorder.record(
+            user_id=user_id,
+            operation=operation,
+            provider="rule_based",
+            model=None,
+            prompt_tokens=0,
+            completion_tokens=0,
+            latency_ms=0.0,
+            outcome="fallback"
+        )
+    
+    def _format_snapshot(self, snapshot: Optional[Dict[str, Any]]) -> str:
+        """Financial snapshot block for prompts; empty when no snapshot is given."""
+        if not snapshot:
+            return ""
+        return f"\nFinancial snapshot (budgets, month-to-date and trailing spend, recurring charges):\n{json.dumps(snapshot)}\n"
     
     def _format_transactions_for_ai(self, transactions: List[Dict]) -> str:
         """Format transaction data for AI analysis."""
@@ -31,18 +62,22 @@ class AIService:
             )
         return "\n".join(formatted)
     
+    @tracer.traced("ai.analyze_spending_patterns")
     def analyze_spending_patterns(
         self,
         transactions: List[Dict],
         monthly_income: Decimal,
         current_budgets: Dict[str, Decimal],
-        months: int = 6
+        months: int = 6,
+        user_id=None,
+        snapshot: Optional[Dict[str, Any]] = None
     ) -> AIAnalysisResponse:
         """
         Analyze spending patterns and generate budget recommendations.
         Falls back to rule-based recommendations if AI is unavailable.
         """
-        if not self.client:
+        if not self.router.enabled:
+            self._record_fallback("analyze_spending_patterns", user_id)
             return self._rule_based_recommendations(transactions, monthly_income, current_budgets)
         
         try:
@@ -52,7 +87,7 @@ class AIService:
 
 The user's monthly income is ${monthly_income}.
 Current budget limits: {json.dumps({k: str(v) for k, v in current_budgets.items()})}
-
+{self._format_snapshot(snapshot)}
 Provide:
 1. Realistic budget recommendations per category (as JSON array with category_name, recommended_limit, reasoning)
 2. Key spending patterns identified (as JSON array of strings)
@@ -67,45 +102,36 @@ Format your response as JSON:
   "suggestions": ["suggestion1", "suggestion2"]
 }}"""
 
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a financial advisor AI that provides budget recommendations based on spending data."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    response_format={"type": "json_object"}
-                )
-                result = json.loads(response.choices[0].message.content)
-            else:  # anthropic
-                response = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=2000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
+            def parse(text: str) -> AIAnalysisResponse:
+                result = json.loads(text)
+                recommendations = [
+                    BudgetRecommendation(
+                        category_id=None,  # Will be set by caller
+                        category_name=rec["category_name"],
+                        recommended_limit=Decimal(str(rec["recommended_limit"])),
+                        reasoning=rec["reasoning"]
+                    )
+                    for rec in result.get("recommendations", [])
+                ]
+                return AIAnalysisResponse(
+                    recommendations=recommendations,
+                    patterns=result.get("patterns", []),
+                    suggestions=result.get("suggestions", [])
                 )
-                result = json.loads(response.content[0].text)
             
-            # Convert to response format
-            recommendations = [
-                BudgetRecommendation(
-                    category_id=None,  # Will be set by caller
-                    category_name=rec["category_name"],
-                    recommended_limit=Decimal(str(rec["recommended_limit"])),
-                    reasoning=rec["reasoning"]
-                )
-                for rec in result.get("recommendations", [])
-            ]
-            
-            return AIAnalysisResponse(
-                recommendations=recommendations,
-                patterns=result.get("patterns", []),
-                suggestions=result.get("suggestions", [])
+            return self._call_provider(
+                "analyze_spending_patterns",
+                prompt,
+                system="You are a financial advisor AI that provides budget recommendations based on spending data.",
+                temperature=0.7,
+                max_tokens=2000,
+                json_mode=True,
+                parse=parse,
+                user_id=user_id
             )
         except Exception as e:
             # Fallback to rule-based
+            set_span_attribute("ai.fallback", type(e).__name__)
             return self._rule_based_recommendations(transactions, monthly_income, current_budgets)
     
     def _rule_based_recommendations(
@@ -150,15 +176,19 @@ Format your response as JSON:
             suggestions=suggestions
         )
     
+    @tracer.traced("ai.adapt_budget_for_life_event")
     def adapt_budget_for_life_event(
         self,
         event_type: str,
         event_description: str,
         current_budgets: Dict[str, Decimal],
-        spending_patterns: Dict[str, Decimal]
+        spending_patterns: Dict[str, Decimal],
+        user_id=None,
+        snapshot: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Generate budget adjustments based on life events."""
-        if not self.client:
+        if not self.router.enabled:
+            self._record_fallback("adapt_budget_for_life_event", user_id)
             return self._rule_based_life_event_adjustment(event_type, current_budgets)
         
         try:
@@ -167,7 +197,7 @@ Description: {event_description}
 
 Current budget: {json.dumps({k: str(v) for k, v in current_budgets.items()})}
 Typical spending patterns: {json.dumps({k: str(v) for k, v in spending_patterns.items()})}
-
+{self._format_snapshot(snapshot)}
 Suggest how their budget should be adjusted and explain why. Format as JSON:
 {{
   "adjustments": [
@@ -176,29 +206,18 @@ Suggest how their budget should be adjusted and explain why. Format as JSON:
   "overall_advice": "..."
 }}"""
 
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a financial advisor AI that helps adjust budgets based on life events."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    response_format={"type": "json_object"}
-                )
-                result = json.loads(response.choices[0].message.content)
-            else:  # anthropic
-                response = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=2000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                result = json.loads(response.content[0].text)
-            
-            return result
+            return self._call_provider(
+                "adapt_budget_for_life_event",
+                prompt,
+                system="You are a financial advisor AI that helps adjust budgets based on life events.",
+                temperature=0.7,
+                max_tokens=2000,
+                json_mode=True,
+                parse=json.loads,
+                user_id=user_id
+            )
         except Exception as e:
+            set_span_attribute("ai.fallback", type(e).__name__)
             return self._rule_based_life_event_adjustment(event_type, current_budgets)
     
     def _rule_based_life_event_adjustment(
@@ -232,13 +251,17 @@ Suggest how their budget should be adjusted and explain why. Format as JSON:
             "overall_advice": "Consider reviewing your budget regularly after major life changes."
         }
     
+    @tracer.traced("ai.generate_spending_insights")
     def generate_spending_insights(
         self,
         transactions: List[Dict],
-        budgets: Dict[str, Decimal]
+        budgets: Dict[str, Decimal],
+        user_id=None,
+        snapshot: Optional[Dict[str, Any]] = None
     ) -> List[str]:
         """Generate conversational insights about spending behavior."""
-        if not self.client:
+        if not self.router.enabled:
+            self._record_fallback("generate_spending_insights", user_id)
             return self._rule_based_insights(transactions, budgets)
         
         try:
@@ -247,33 +270,27 @@ Suggest how their budget should be adjusted and explain why. Format as JSON:
 
 Compared to the budget:
 {json.dumps({k: str(v) for k, v in budgets.items()})}
-
+{self._format_snapshot(snapshot)}
 Generate 3-5 conversational insights about the user's spending behavior. Be specific, actionable, and encouraging. Format as JSON array of strings:
 ["insight1", "insight2", "insight3"]"""
 
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a friendly financial assistant that provides helpful spending insights."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.8,
-                    response_format={"type": "json_object"}
-                )
-                result = json.loads(response.choices[0].message.content)
-                return result.get("insights", [])
-            else:  # anthropic
-                response = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=1000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                result = json.loads(response.content[0].text)
-                return json.loads(result) if isinstance(result, str) else result.get("insights", [])
+            def parse(text: str) -> List[str]:
+                result = json.loads(text)
+                return result if isinstance(result, list) else result.get("insights", [])
+            
+            return self._call_provider(
+                "generate_spending_insights",
+                prompt,
+                system="You are a friendly financial assistant that provides helpful spending insights.",
+                temperature=0.8,
+                max_tokens=1000,
+                json_mode=True,
+                parse=parse,
+                user_id=user_id,
+                tier="fast"
+            )
         except Exception as e:
+            set_span_attribute("ai.fallback", type(e).__name__)
             return self._rule_based_insights(transactions, budgets)
     
     def _rule_based_insights(
@@ -293,9 +310,14 @@ Generate 3-5 conversational insights about the user's spending behavior. Be spec
         
         return insights
     
-    def answer_question(self, question: str, context: Dict[str, Any]) -> str:
-        """Answer a user's question about their budget/finances."""
-        if not self.client:
+    @tracer.traced("ai.answer_question")
+    def answer_question(self, question: str, context: Dict[str, Any], user_id=None, data_version: Optional[int] = None) -> str:
+        """
+        Answer a user's question about their budget/finances.
+        Provider answers are cached per user when a data version is given.
+        """
+        if not self.router.enabled:
+            self._record_fallback("answer_question", user_id)
             return "AI service is not configured. Please check your API keys."
         
         try:
@@ -307,26 +329,19 @@ User question: {question}
 
 Provide a helpful, accurate answer about their budget and finances."""
 
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful financial advisor AI."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7
-                )
-                return response.choices[0].message.content
-            else:  # anthropic
-                response = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=1000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                return response.content[0].text
+            answer = self._call_provider(
+                "answer_question",
+                prompt,
+                system="You are a helpful financial advisor AI.",
+                temperature=0.7,
+                max_tokens=1000,
+                user_id=user_id
+            )
+            if user_id is not None and data_version is not None:
+                answer_cache.put(user_id, question, data_version, answer)
+            return answer
         except Exception as e:
+            set_span_attribute("ai.fallback", type(e).__name__)
             return f"Sorry, I encountered an error: {str(e)}"
 
 
@@ -0,0 +1,236 @@
+"""
+Usage and latency accounting for AI provider calls.
+
+Every call is counted in the Prometheus registry immediately and queued for a batched
+insert into ai_usage_records, so recording never adds a database round trip to the
+request that made the call.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from config import settings
+from database import SessionLocal
+from models.ai_usage_record import AIUsageRecord
+from models.user import User
+from utils.metrics import REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# USD per 1K (prompt, completion) tokens; unknown models are costed at zero
+MODEL_PRICES: Dict[str, Tuple[Decimal, Decimal]] = {
+    "gpt-4": (Decimal("0.03"), Decimal("0.06")),
+    "gpt-4o": (Decimal("0.005"), Decimal("0.015")),
+    "gpt-3.5-turbo": (Decimal("0.0005"), Decimal("0.0015")),
+    "claude-3-opus-20240229": (Decimal("0.015"), Decimal("0.075")),
+    "claude-3-sonnet-20240229": (Decimal("0.003"), Decimal("0.015")),
+    "claude-3-haiku-20240307": (Decimal("0.00025"), Decimal("0.00125")),
+}
+
+AI_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+AI_CALLS = REGISTRY.register(Counter(
+    "ai_calls_total", "AI calls by provider, model, operation and outcome", ("provider", "model", "operation", "outcome")
+))
+AI_CALL_DURATION = REGISTRY.register(Histogram(
+    "ai_call_duration_seconds", "AI provider call latency", ("provider", "model", "operation"), AI_LATENCY_BUCKETS
+))
+AI_TOKENS = REGISTRY.register(Counter(
+    "ai_tokens_total", "AI tokens consumed", ("provider", "model", "kind")
+))
+AI_COST = REGISTRY.register(Counter(
+    "ai_cost_usd_total", "Estimated AI spend in USD", ("provider", "model")
+))
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> Decimal:
+    prompt_price, completion_price = MODEL_PRICES.get(model or "", (Decimal(0), Decimal(0)))
+    cost = (prompt_price * prompt_tokens + completion_price * completion_tokens) / 1000
+    return cost.quantize(Decimal("0.000001"))
+
+
+class UsageRecorder:
+    """Counts AI calls in metrics and persists them in batches from a background thread."""
+    
+    def __init__(self, batch_size: int = 200, interval: float = 5.0, max_queue_size: int = 10000):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+    
+    def _ensure_started(self):
+        # Started on first use so scripts that never call a provider don't spawn a thread
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="ai-usage-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+    
+    def record(
+        self,
+        operation: str,
+        provider: str,
+        model: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: float,
+        outcome: str,
+        user_id=None
+    ) -> Decimal:
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        model_label = model or "none"
+        AI_CALLS.inc(provider=provider, model=model_label, operation=operation, outcome=outcome)
+        if outcome != "fallback":
+            AI_CALL_DURATION.observe(latency_ms / 1000, provider=provider, model=model_label, operation=operation)
+        if prompt_tokens:
+            AI_TOKENS.inc(prompt_tokens, provider=provider, model=model_label, kind="prompt")
+        if completion_tokens:
+            AI_TOKENS.inc(completion_tokens, provider=provider, model=model_label, kind="completion")
+        if cost:
+            AI_COST.inc(float(cost), provider=provider, model=model_label)
+        
+        if not settings.AI_USAGE_TRACKING_ENABLED:
+            return cost
+        self._ensure_started()
+        try:
+            self._queue.put_nowait({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "operation": operation,
+                "provider": provider,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "latency_ms": latency_ms,
+                "outcome": outcome,
+                "estimated_cost": cost,
+                "created_at": datetime.now(timezone.utc),
+            })
+        except queue.Full:
+            logger.warning("AI usage queue full; dropping record for %s", operation)
+        return cost
+    
+    def _drain(self) -> List[dict]:
+        rows = []
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+    
+    def _write(self, rows: List[dict]):
+        db = SessionLocal()
+        try:
+            db.execute(insert(AIUsageRecord), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # One bad row (e.g. a user purged since the call) must not lose the batch
+            for row in rows:
+                try:
+                    db.execute(insert(AIUsageRecord), [row])
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.exception("Could not record AI usage for %s", row["operation"])
+        finally:
+            db.close()
+    
+    def flush(self):
+        with self._flush_lock:
+            while True:
+                rows = self._drain()
+                if not rows:
+                    return
+                try:
+                    self._write(rows)
+                except Exception:
+                    # Accounting must never break the application
+                    logger.exception("AI usage flush failed")
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+ai_usage_recorder = UsageRecorder()
+
+
+def summarize_usage(db: Session, since: datetime, top_users: int = 10) -> dict:
+    """Calls, tokens, latency and cost per provider/model/outcome, plus the costliest users."""
+    rows = db.query(
+        AIUsageRecord.provider,
+        AIUsageRecord.model,
+        AIUsageRecord.outcome,
+        func.count(AIUsageRecord.id).label("calls"),
+        func.coalesce(func.sum(AIUsageRecord.prompt_tokens), 0).label("prompt_tokens"),
+        func.coalesce(func.sum(AIUsageRecord.completion_tokens), 0).label("completion_tokens"),
+        func.avg(AIUsageRecord.latency_ms).label("avg_latency_ms"),
+        func.percentile_cont(0.95).within_group(AIUsageRecord.latency_ms).label("p95_latency_ms"),
+        func.coalesce(func.sum(AIUsageRecord.estimated_cost), 0).label("estimated_cost"),
+    ).filter(
+        AIUsageRecord.created_at >= since
+    ).group_by(
+        AIUsageRecord.provider, AIUsageRecord.model, AIUsageRecord.outcome
+    ).order_by(
+        AIUsageRecord.provider, AIUsageRecord.model, AIUsageRecord.outcome
+    ).all()
+    
+    users = db.query(
+        AIUsageRecord.user_id,
+        User.username,
+        func.count(AIUsageRecord.id).label("calls"),
+        func.coalesce(func.sum(AIUsageRecord.prompt_tokens + AIUsageRecord.completion_tokens), 0).label("tokens"),
+        func.coalesce(func.sum(AIUsageRecord.estimated_cost), 0).label("estimated_cost"),
+    ).join(
+        User, User.id == AIUsageRecord.user_id
+    ).filter(
+        AIUsageRecord.created_at >= since
+    ).group_by(
+        AIUsageRecord.user_id, User.username
+    ).order_by(
+        func.sum(AIUsageRecord.estimated_cost).desc(), func.count(AIUsageRecord.id).desc()
+    ).limit(top_users).all()
+    
+    breakdown = [
+        {
+            "provider": row.provider,
+            "model": row.model,
+            "outcome": row.outcome,
+            "calls": row.calls,
+            "prompt_tokens": int(row.prompt_tokens),
+            "completion_tokens": int(row.completion_tokens),
+            "avg_latency_ms": round(float(row.avg_latency_ms or 0), 1),
+            "p95_latency_ms": round(float(row.p95_latency_ms or 0), 1),
+            "estimated_cost": row.estimated_cost,
+        }
+        for row in rows
+    ]
+    return {
+        "since": since,
+        "total_calls": sum(item["calls"] for item in breakdown),
+        "total_cost": sum((item["estimated_cost"] for item in breakdown), Decimal(0)),
+        "breakdown": breakdown,
+        "top_users": [
+            {
+                "user_id": row.user_id,
+                "username": row.username,
+                "calls": row.calls,
+                "tokens": int(row.tokens),
+                "estimated_cost": row.estimated_cost,
+            }
+            for row in users
+        ],
+    }
@@ -0,0 +1,158 @@
+"""
+Per-user cache of AI answers, matched by lexical similarity of the question.
+
+Questions are normalized and compared with TF-IDF cosine similarity over the terms of
+every cached question, so "How much did I spend on food?" and "how much have I spent
+on food" share an answer while "...on rent?" does not. Entries are tied to the user's
+data version (user_write_stamps.data_version, bumped by writes made in the user's
+session) and to the day they were answered, and expire after AI_ASK_CACHE_TTL_SECONDS.
+Writes made outside the user's session, such as admin tools, are only picked up once
+the TTL ends.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter as TermCounter, OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from config import settings
+from utils.metrics import REGISTRY, Counter
+
+ANSWER_CACHE = REGISTRY.register(Counter(
+    "ai_answer_cache_total", "AI answer cache lookups by result", ("result",)
+))
+
+STOPWORDS = frozenset("""
+a an the i me my we our you your is are was were be been am do does did doing have has had
+to of in on at for from by with about as it its what which who how
+can could would should will shall may might please tell show give much many there any
+and or but so if then than just really
+""".split())
+
+IRREGULAR = {"spent": "spend", "paid": "pay", "bought": "buy", "made": "make", "got": "get"}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    # Deliberately light: folds plurals and common verb endings, keeps short words intact
+    if token in IRREGULAR:
+        return IRREGULAR[token]
+    if len(token) > 5 and token.endswith("ies"):
+        return token[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def normalize_question(question: str) -> Tuple[str, ...]:
+    """Lowercased, stemmed content terms in order."""
+    return tuple(_stem(t) for t in _TOKEN.findall(question.lower()) if t not in STOPWORDS)
+
+
+class _Entry:
+    __slots__ = ("terms", "tf", "answer", "version", "day", "created")
+    
+    def __init__(self, terms: Tuple[str, ...], answer: str, version: int):
+        self.terms = terms
+        self.tf = TermCounter(terms)
+        self.answer = answer
+        self.version = version
+        self.day = date.today()  # "This month" means something else tomorrow
+        self.created = time.monotonic()
+
+
+class AnswerCache:
+    def __init__(self, max_users: int = 10000, max_entries_per_user: int = 50):
+        self.max_users = max_users
+        self.max_entries_per_user = max_entries_per_user
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, List[_Entry]]" = OrderedDict()
+        self._document_frequency: TermCounter = TermCounter()
+        self._documents = 0
+    
+    def _idf(self, term: str) -> float:
+        return math.log((1 + self._documents) / (1 + self._document_frequency[term])) + 1
+    
+    def _vector(self, tf: TermCounter) -> Dict[str, float]:
+        return {term: count * self._idf(term) for term, count in tf.items()}
+    
+    @staticmethod
+    def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+        if not dot:
+            return 0.0
+        norm_a = math.sqrt(sum(w * w for w in a.values()))
+        norm_b = math.sqrt(sum(w * w for w in b.values()))
+        return dot / (norm_a * norm_b)
+    
+    def _forget(self, entries: List[_Entry]):
+        for entry in entries:
+            self._document_frequency.subtract(set(entry.terms))
+            self._documents -= 1
+        self._document_frequency += TermCounter()  # Drop zero counts
+    
+    def _live(self, key: str, version: int) -> List[_Entry]:
+        entries = self._entries.get(key)
+        if not entries:
+            return []
+        cutoff = time.monotonic() - settings.AI_ASK_CACHE_TTL_SECONDS
+        today = date.today()
+        live = [e for e in entries if e.version == version and e.day == today and e.created >= cutoff]
+        if len(live) != len(entries):
+            self._forget([e for e in entries if e not in live])
+            self._entries[key] = live
+        return live
+    
+    def get(self, user_id, question: str, version: int) -> Optional[str]:
+        """Best cached answer for a similar question at the same data version, if similar enough."""
+        if not settings.AI_ASK_CACHE_ENABLED:
+            return None
+        terms = normalize_question(question)
+        key = str(user_id)
+        best, best_score = None, 0.0
+        with self._lock:
+            entries = self._live(key, version)
+            if terms and entries:
+                self._entries.move_to_end(key)
+                query = self._vector(TermCounter(terms))
+                for entry in entries:
+                    score = 1.0 if entry.terms == terms else self._cosine(query, self._vector(entry.tf))
+                    if score > best_score:
+                        best, best_score = entry, score
+        if best is not None and best_score >= settings.AI_ASK_CACHE_THRESHOLD:
+            ANSWER_CACHE.inc(result="hit")
+            return best.answer
+        ANSWER_CACHE.inc(result="miss")
+        return None
+    
+    def put(self, user_id, question: str, version: int, answer: str):
+        if not settings.AI_ASK_CACHE_ENABLED:
+            return
+        terms = normalize_question(question)
+        if not terms:
+            return
+        key = str(user_id)
+        with self._lock:
+            entries = self._live(key, version)
+            replaced = [e for e in entries if e.terms == terms]
+            entries = [e for e in entries if e.terms != terms]
+            entries.append(_Entry(terms, answer, version))
+            evicted = replaced + entries[:-self.max_entries_per_user]
+            self._forget(evicted)
+            self._entries[key] = entries[-self.max_entries_per_user:]
+            self._entries.move_to_end(key)
+            self._document_frequency.update(set(terms))
+            self._documents += 1
+            while len(self._entries) > self.max_users:
+                _, old = self._entries.popitem(last=False)
+                self._forget(old)
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._forget(self._entries.pop(str(user_id), []))
+
+
+answer_cache = AnswerCache()
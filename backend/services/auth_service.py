@@ -1,13 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, insert
 from models.user import User, FinancialProfile
 from models.category import Category
 from schemas.auth import RegisterRequest
 from utils.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
+from typing import List, Tuple
 from config import settings
 import uuid
 
+# Below this many passwords, starting worker processes costs more than it saves
+PARALLEL_HASH_THRESHOLD = 16
+
 
 # Default categories for new users
 DEFAULT_CATEGORIES = [
@@ -70,10 +75,88 @@ def create_user(db: Session, user_data: RegisterRequest, financial_profile_data:
     return user
 
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash passwords across a process pool; bcrypt is CPU-bound and holds the GIL."""
+    if len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return [get_password_hash(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=settings.PROVISIONING_HASH_WORKERS) as executor:
+        return list(executor.map(get_password_hash, passwords, chunksize=8))
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def provision_users(db: Session, users: list) -> Tuple[int, List[dict]]:
+    """
+    Create many users with profiles and default categories.
+    Uniqueness is checked with one query for the whole batch, passwords are hashed in
+    parallel, and rows are written with chunked multi-row INSERTs in one transaction.
+    Returns the number created and the users skipped with the reason.
+    """
+    skipped = []
+    seen_usernames, seen_emails = set(), set()
+    candidates = []
+    for user_data in users:
+        if user_data.username in seen_usernames or user_data.email in seen_emails:
+            skipped.append({"username": user_data.username, "email": user_data.email, "reason": "Duplicate in request"})
+            continue
+        seen_usernames.add(user_data.username)
+        seen_emails.add(user_data.email)
+        candidates.append(user_data)
+    
+    existing = db.query(User.username, User.email).filter(
+        or_(User.username.in_(seen_usernames), User.email.in_(seen_emails))
+    ).all()
+    taken_usernames = {row.username for row in existing}
+    taken_emails = {row.email for row in existing}
+    
+    new_users = []
+    for user_data in candidates:
+        if user_data.username in taken_usernames or user_data.email in taken_emails:
+            skipped.append({"username": user_data.username, "email": user_data.email, "reason": "Username or email already exists"})
+        else:
+            new_users.append(user_data)
+    if not new_users:
+        return 0, skipped
+    
+    password_hashes = hash_passwords([user_data.password for user_data in new_users])
+    
+    user_rows, profile_rows, category_rows = [], [], []
+    for user_data, password_hash in zip(new_users, password_hashes):
+        user_id = uuid.uuid4()
+        user_rows.append({
+            "id": user_id,
+            "username": user_data.username,
+            "full_name": user_data.full_name,
+            "email": user_data.email,
+            "phone": user_data.phone,
+            "password_hash": password_hash
+        })
+        profile_rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "monthly_income": user_data.monthly_income,
+            "current_savings": user_data.current_savings,
+            "financial_goals": None,
+            "currency": user_data.currency
+        })
+        category_rows.extend({"id": uuid.uuid4(), "user_id": user_id, **cat_data} for cat_data in DEFAULT_CATEGORIES)
+    
+    chunk_size = settings.PROVISIONING_CHUNK_SIZE
+    for model, rows in ((User, user_rows), (FinancialProfile, profile_rows), (Category, category_rows)):
+        for chunk in _chunks(rows, chunk_size):
+            db.execute(insert(model), chunk)
+    db.commit()
+    return len(user_rows), skipped
+
+
 def authenticate_user(db: Session, username: str, password: str) -> User | None:
     """Authenticate a user by username/email and password."""
     user = db.query(User).filter(
-        or_(User.username == username, User.email == username)
+        or_(User.username == username, User.email == username),
+        User.deleted_at.is_(None)
     ).first()
     
     if not user:
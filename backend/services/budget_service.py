@@ -0,0 +1,209 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from database import engine
+from models.budget import Budget
+from models.budget_period_balance import BudgetPeriodBalance
+from models.category import Category
+from models.transaction import Transaction
+from schemas.budget import BudgetStatusResponse
+
+BUDGET_PERIODS = ("weekly", "monthly", "quarterly", "yearly")
+
+
+def period_bounds(budget_period: str, day: date) -> Tuple[date, date]:
+    """Start (inclusive) and end (exclusive) of the budget period containing `day`."""
+    if budget_period == "weekly":
+        start = day - relativedelta(days=day.weekday())
+        return start, start + relativedelta(weeks=1)
+    if budget_period == "quarterly":
+        start = date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+        return start, start + relativedelta(months=3)
+    if budget_period == "yearly":
+        start = date(day.year, 1, 1)
+        return start, start + relativedelta(years=1)
+    start = date(day.year, day.month, 1)
+    return start, start + relativedelta(months=1)
+
+
+def _daily_spend(db: Session, user_id, category_ids: Iterable, start: date, end: date) -> Dict:
+    """Spend per (category_id, day) in [start, end), from one grouped query."""
+    rows = db.query(
+        Transaction.category_id,
+        Transaction.transaction_date,
+        func.sum(Transaction.amount)
+    ).filter(
+        and_(
+            Transaction.user_id == user_id,
+            Transaction.category_id.in_(list(category_ids)),
+            Transaction.transaction_date >= start,
+            Transaction.transaction_date < end
+        )
+    ).group_by(Transaction.category_id, Transaction.transaction_date).all()
+    spend = defaultdict(list)
+    for category_id, day, amount in rows:
+        spend[category_id].append((day, amount))
+    return spend
+
+
+def _first_period_start(budget: Budget) -> date:
+    created = budget.created_at.date() if budget.created_at else date.today()
+    return period_bounds(budget.budget_period, created)[0]
+
+
+def _carry_forward(db: Session, user_id, budgets: List[Budget], current_starts: Dict) -> Dict:
+    """
+    Balance carried into the current period for each rollover budget.
+    Closed periods are materialized in budget_period_balances, so a status call only
+    aggregates periods closed since the last call rather than the whole history.
+    """
+    if not budgets:
+        return {}
+    
+    latest_start = select(
+        BudgetPeriodBalance.budget_id,
+        func.max(BudgetPeriodBalance.period_start).label("period_start")
+    ).where(
+        BudgetPeriodBalance.budget_id.in_([budget.id for budget in budgets])
+    ).group_by(BudgetPeriodBalance.budget_id).subquery()
+    latest = {
+        row.budget_id: row for row in db.query(BudgetPeriodBalance).join(
+            latest_start,
+            and_(
+                BudgetPeriodBalance.budget_id == latest_start.c.budget_id,
+                BudgetPeriodBalance.period_start == latest_start.c.period_start
+            )
+        ).all()
+    }
+    
+    carry = {}
+    pending = []  # (budget, first unmaterialized period start, opening balance)
+    for budget in budgets:
+        stored = latest.get(budget.id)
+        resume = stored.period_end if stored else _first_period_start(budget)
+        opening = stored.closing_balance if stored else Decimal(0)
+        if resume >= current_starts[budget.id]:
+            carry[budget.id] = opening
+        else:
+            pending.append((budget, resume, opening))
+    
+    if pending:
+        closed = []
+        spend = _daily_spend(
+            db, user_id,
+            {budget.category_id for budget, _, _ in pending},
+            min(resume for _, resume, _ in pending),
+            max(current_starts[budget.id] for budget, _, _ in pending)
+        )
+        for budget, resume, opening in pending:
+            spent_by_period = defaultdict(Decimal)
+            for day, amount in spend.get(budget.category_id, []):
+                if resume <= day < current_starts[budget.id]:
+                    spent_by_period[period_bounds(budget.budget_period, day)[0]] += amount
+            
+            balance = opening
+            period_start = resume
+            while period_start < current_starts[budget.id]:
+                _, period_end = period_bounds(budget.budget_period, period_start)
+                spent = spent_by_period.get(period_start, Decimal(0))
+                balance = balance + budget.monthly_limit - spent
+                closed.append({
+                    "budget_id": budget.id,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "budget_limit": budget.monthly_limit,
+                    "spent": spent,
+                    "closing_balance": balance
+                })
+                period_start = period_end
+            carry[budget.id] = balance
+        # Written on a connection of its own: committing the caller's session would expire
+        # its budgets and count as a user write. Concurrent status calls materialize the
+        # same periods from the same data; whichever commits second keeps the first's rows
+        with engine.begin() as conn:
+            conn.execute(
+                insert(BudgetPeriodBalance).values(closed).on_conflict_do_nothing(
+                    index_elements=["budget_id", "period_start"]
+                )
+            )
+    
+    return carry
+
+
+def invalidate_balances(db: Session, user_id, category_ids: Iterable, since: date):
+    """Drop materialized periods a transaction change dated `since` may have made stale."""
+    category_ids = [category_id for category_id in category_ids if category_id is not None]
+    if not category_ids:
+        return
+    db.execute(
+        delete(BudgetPeriodBalance).where(
+            and_(
+                BudgetPeriodBalance.budget_id.in_(
+                    select(Budget.id).where(
+                        and_(
+                            Budget.user_id == user_id,
+                            Budget.category_id.in_(category_ids)
+                        )
+                    )
+                ),
+                BudgetPeriodBalance.period_end > since
+            )
+        ),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def build_budget_status(db: Session, user_id, today: Optional[date] = None) -> List[BudgetStatusResponse]:
+    """Spent vs limit for each budget's current period, including rollover carry-forward."""
+    today = today or date.today()
+    rows = db.query(Budget, Category.name).outerjoin(
+        Category, Category.id == Budget.category_id
+    ).filter(Budget.user_id == user_id).all()
+    if not rows:
+        return []
+    
+    periods = {budget.id: period_bounds(budget.budget_period, today) for budget, _ in rows}
+    current_starts = {budget_id: bounds[0] for budget_id, bounds in periods.items()}
+    
+    spend = _daily_spend(
+        db, user_id,
+        {budget.category_id for budget, _ in rows},
+        min(start for start, _ in periods.values()),
+        max(end for _, end in periods.values())
+    )
+    carry = _carry_forward(
+        db, user_id,
+        [budget for budget, _ in rows if budget.rollover_enabled],
+        current_starts
+    )
+    
+    status_list = []
+    for budget, category_name in rows:
+        period_start, period_end = periods[budget.id]
+        spent = sum(
+            (amount for day, amount in spend.get(budget.category_id, []) if period_start <= day < period_end),
+            Decimal(0)
+        )
+        rollover_amount = carry.get(budget.id, Decimal(0))
+        available = budget.monthly_limit + rollover_amount
+        percentage_used = float((spent / available * 100) if available > 0 else 0)
+        
+        status_list.append(BudgetStatusResponse(
+            category_id=budget.category_id,
+            category_name=category_name or "Unknown",
+            budget_limit=budget.monthly_limit,
+            spent=spent,
+            remaining=available - spent,
+            percentage_used=percentage_used,
+            budget_period=budget.budget_period,
+            period_start=period_start,
+            period_end=period_end - relativedelta(days=1),
+            rollover_amount=rollover_amount
+        ))
+    
+    return status_list
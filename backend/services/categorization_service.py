@@ -0,0 +1,191 @@
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from decimal import Decimal
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from config import settings
+from models.category import Category
+from models.transaction import Transaction
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9&']+")
+
+
+def extract_features(description: Optional[str], payment_method: Optional[str], amount) -> List[str]:
+    """Tokens from the description plus payment-method and amount-bucket features."""
+    features = TOKEN_PATTERN.findall((description or "").lower())
+    if payment_method:
+        features.append(f"pm:{payment_method.lower()}")
+    if amount is not None:
+        # Log-scale buckets: 0-1, 1-3, 3-7, 7-15, ...
+        features.append(f"amt:{int(math.log2(float(amount) + 1))}")
+    return features
+
+
+class NaiveBayesModel:
+    """Multinomial naive Bayes over transaction features, updated incrementally."""
+    
+    def __init__(self):
+        self.class_counts = Counter()
+        self.feature_counts: Dict[str, Counter] = {}
+        self.feature_totals = Counter()
+        self.vocabulary = Counter()
+    
+    @property
+    def examples(self) -> int:
+        return sum(self.class_counts.values())
+    
+    def learn(self, features: List[str], label: str):
+        self.class_counts[label] += 1
+        counts = self.feature_counts.setdefault(label, Counter())
+        for feature in features:
+            counts[feature] += 1
+            self.vocabulary[feature] += 1
+        self.feature_totals[label] += len(features)
+    
+    def forget(self, features: List[str], label: str):
+        if self.class_counts[label] <= 0:
+            return
+        self.class_counts[label] -= 1
+        counts = self.feature_counts.get(label, Counter())
+        for feature in features:
+            if counts[feature] > 0:
+                counts[feature] -= 1
+                self.feature_totals[label] -= 1
+                self.vocabulary[feature] -= 1
+                if self.vocabulary[feature] <= 0:
+                    del self.vocabulary[feature]
+        if self.class_counts[label] == 0:
+            del self.class_counts[label]
+            self.feature_counts.pop(label, None)
+            self.feature_totals.pop(label, None)
+    
+    def predict(self, features: List[str]) -> Tuple[Optional[str], float]:
+        """Most likely label and its posterior probability."""
+        labels = [label for label, count in self.class_counts.items() if count > 0]
+        if not labels or not features:
+            return None, 0.0
+        
+        total = self.examples
+        vocabulary_size = len(self.vocabulary) + 1
+        scores = {}
+        for label in labels:
+            counts = self.feature_counts[label]
+            denominator = self.feature_totals[label] + vocabulary_size
+            score = math.log(self.class_counts[label] / total)
+            for feature in features:
+                score += math.log((counts[feature] + 1) / denominator)
+            scores[label] = score
+        
+        # Normalize log scores into posterior probabilities
+        best = max(scores, key=scores.get)
+        peak = scores[best]
+        normalizer = sum(math.exp(score - peak) for score in scores.values())
+        return best, 1.0 / normalizer
+
+
+class CategorizationService:
+    """
+    Per-user local transaction categorizer.
+    Models are trained lazily from a user's categorized history, kept in an LRU cache
+    and updated incrementally as transactions are categorized, recategorized or deleted.
+    A cached model is retrained once the user's set of categories changes.
+    """
+    
+    def __init__(self, max_users: int = 1000):
+        self._models: "OrderedDict[str, Tuple[FrozenSet[str], NaiveBayesModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_users = max_users
+    
+    def _train(self, db: Session, user_id) -> NaiveBayesModel:
+        model = NaiveBayesModel()
+        rows = db.query(
+            Transaction.description,
+            Transaction.payment_method,
+            Transaction.amount,
+            Transaction.category_id
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.category_id.isnot(None),
+            # Learn only from categories the user chose, not from earlier predictions
+            Transaction.category_confidence.is_(None)
+        ).order_by(
+            Transaction.transaction_date.desc()
+        ).limit(settings.AUTO_CATEGORIZE_TRAINING_LIMIT).yield_per(1000)
+        
+        for row in rows:
+            model.learn(extract_features(row.description, row.payment_method, row.amount), str(row.category_id))
+        return model
+    
+    def _version(self, db: Session, user_id) -> FrozenSet[str]:
+        """
+        The user's category ids, so a category deleted through any worker retrains the
+        model instead of leaving it predicting an id that no longer exists. Read once
+        per session.
+        """
+        versions = db.info.setdefault("category_set_versions", {})
+        key = str(user_id)
+        if key not in versions:
+            versions[key] = frozenset(
+                str(row.id) for row in db.query(Category.id).filter(Category.user_id == user_id)
+            )
+        return versions[key]
+    
+    def get_model(self, db: Session, user_id) -> NaiveBayesModel:
+        key = str(user_id)
+        # Read the version before training so a concurrent change makes the result stale, not wrong
+        version = self._version(db, user_id)
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None and cached[0] == version:
+                self._models.move_to_end(key)
+                return cached[1]
+        
+        model = self._train(db, user_id)
+        with self._lock:
+            self._models[key] = (version, model)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_users:
+                self._models.popitem(last=False)
+        return model
+    
+    def learn(self, user_id, description, payment_method, amount, category_id):
+        """Record a categorized transaction in the user's model, if it is loaded."""
+        with self._lock:
+            cached = self._models.get(str(user_id))
+            if cached is not None and category_id:
+                cached[1].learn(extract_features(description, payment_method, amount), str(category_id))
+    
+    def forget(self, user_id, description, payment_method, amount, category_id):
+        """Remove a previously learned transaction from the user's model, if it is loaded."""
+        with self._lock:
+            cached = self._models.get(str(user_id))
+            if cached is not None and category_id:
+                cached[1].forget(extract_features(description, payment_method, amount), str(category_id))
+    
+    def invalidate(self, user_id):
+        """Drop a user's model so it is retrained from history on next use."""
+        with self._lock:
+            self._models.pop(str(user_id), None)
+    
+    def predict(
+        self,
+        db: Session,
+        user_id,
+        description: Optional[str],
+        payment_method: Optional[str],
+        amount: Optional[Decimal]
+    ) -> Tuple[Optional[str], float]:
+        """
+        Suggest a category id with a confidence score.
+        Returns (None, 0.0) until the user has enough categorized history.
+        """
+        model = self.get_model(db, user_id)
+        with self._lock:
+            if model.examples < settings.AUTO_CATEGORIZE_MIN_EXAMPLES or len(model.class_counts) < 2:
+                return None, 0.0
+            return model.predict(extract_features(description, payment_method, amount))
+
+
+categorization_service = CategorizationService()
@@ -1,20 +1,30 @@
 from typing import Optional
 from config import settings
-import sendgrid
-from sendgrid.helpers.mail import Mail, Email, To, Content
+from utils.tracing import tracer, CLIENT
 
 
 class EmailService:
     def __init__(self):
-        self.sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY) if settings.SENDGRID_API_KEY else None
+        self._sg = None
     
+    @property
+    def sg(self):
+        """SendGrid client, imported and constructed on first use to keep startup fast."""
+        if self._sg is None and settings.SENDGRID_API_KEY:
+            import sendgrid
+            self._sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+        return self._sg
+    
+    @tracer.traced("email.send", CLIENT)
     def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
         """Send an email using SendGrid."""
-        if not self.sg:
+        if not settings.SENDGRID_API_KEY:
             print(f"[Email Service] Would send email to {to_email}: {subject}")
             return False
         
         try:
+            from sendgrid.helpers.mail import Mail, Email, To, Content
+            
             message = Mail(
                 from_email=Email(settings.EMAIL_FROM),
                 to_emails=To(to_email),
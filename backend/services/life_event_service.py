@@ -0,0 +1,99 @@
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import List
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models.ai_insight import AIInsight
+from models.budget import Budget
+from models.budget_adjustment_proposal import BudgetAdjustmentProposal
+from models.category import Category
+from models.life_event import LifeEvent
+from services.ai_service import ai_service
+from services.snapshot_service import snapshot_cache
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+def _to_limit(value) -> Decimal:
+    try:
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+    except (InvalidOperation, TypeError, ValueError):
+        return Decimal(0)
+
+
+def compute_proposals(db: Session, event: LifeEvent) -> List[BudgetAdjustmentProposal]:
+    """
+    Ask for budget adjustments for a life event and store them as pending proposals.
+    Context comes from the user's snapshot, so gathering it costs the same for any number of budgets.
+    """
+    budgets = db.query(Budget, Category.name).join(
+        Category, Category.id == Budget.category_id
+    ).filter(Budget.user_id == event.user_id).all()
+    budgets_by_name = {name: budget for budget, name in budgets}
+    
+    snapshot = snapshot_cache.get(db, event.user_id)
+    current_budgets = {name: budget.monthly_limit for name, budget in budgets_by_name.items()}
+    spending_patterns = {
+        name: Decimal(str(snapshot["spending"].get(name, {}).get("average_transaction", 0)))
+        for name in current_budgets
+    }
+    
+    adjustments = ai_service.adapt_budget_for_life_event(
+        event.event_type,
+        event.description or "",
+        current_budgets,
+        spending_patterns,
+        user_id=event.user_id,
+        snapshot=snapshot
+    )
+    
+    proposals = []
+    for adjustment in adjustments.get("adjustments", []):
+        budget = budgets_by_name.get(adjustment.get("category_name"))
+        proposed_limit = _to_limit(adjustment.get("new_limit"))
+        if budget is None or proposed_limit <= 0:
+            continue
+        percentage = adjustment.get("adjustment_percentage")
+        proposals.append(BudgetAdjustmentProposal(
+            user_id=event.user_id,
+            life_event_id=event.id,
+            budget_id=budget.id,
+            current_limit=budget.monthly_limit,
+            proposed_limit=proposed_limit,
+            adjustment_percentage=_to_limit(percentage) if percentage is not None else None,
+            reasoning=adjustment.get("reasoning")
+        ))
+    
+    db.add_all(proposals)
+    db.add(AIInsight(
+        user_id=event.user_id,
+        insight_type="life_event",
+        content=f"Life event: {event.event_type}. {adjustments.get('overall_advice', '')}"
+    ))
+    event.adjustment_status = "ready"
+    db.commit()
+    return proposals
+
+
+@tracer.traced("life_event.compute_proposals")
+def compute_proposals_in_background(user_id, life_event_id):
+    """BackgroundTasks entry point; runs after the response with its own session."""
+    db = SessionLocal()
+    db.info["user_id"] = user_id
+    try:
+        event = db.query(LifeEvent).filter(
+            LifeEvent.id == life_event_id,
+            LifeEvent.user_id == user_id
+        ).first()
+        if event is None:
+            return
+        try:
+            compute_proposals(db, event)
+        except Exception:
+            db.rollback()
+            logger.exception("Budget proposals for life event %s failed", life_event_id)
+            event.adjustment_status = "failed"
+            db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,307 @@
+import re
+import statistics
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models.alert import Alert
+from models.recurring_series import RecurringSeries
+from models.transaction import Transaction
+from utils.tracing import tracer
+
+# name -> (min interval days, max interval days, calendar step)
+CADENCES = {
+    "weekly": (6, 8, relativedelta(weeks=1)),
+    "biweekly": (13, 16, relativedelta(weeks=2)),
+    "monthly": (27, 33, relativedelta(months=1)),
+    "quarterly": (85, 97, relativedelta(months=3)),
+    "annual": (355, 375, relativedelta(years=1)),
+}
+MIN_OCCURRENCES = {"annual": 2}
+DEFAULT_MIN_OCCURRENCES = 3
+AMOUNT_TOLERANCE = Decimal("0.15")  # Charges within 15% count as the same bill
+REGULARITY = 0.7  # Share of intervals that must fit the cadence
+LOOKBACK_DAYS = 800  # Long enough to see an annual charge twice
+
+NOISE_TOKENS = {
+    "pos", "purchase", "debit", "credit", "card", "payment", "ach", "online",
+    "recurring", "autopay", "bill", "inc", "llc", "ltd", "co", "com", "www",
+}
+TOKEN_PATTERN = re.compile(r"[a-z][a-z&']+")
+
+
+def normalize_description(description: Optional[str]) -> Optional[str]:
+    """Merchant key: lowercase words without numbers, reference ids or payment noise."""
+    tokens = [
+        token for token in TOKEN_PATTERN.findall((description or "").lower())
+        if token not in NOISE_TOKENS
+    ]
+    return " ".join(tokens[:4]) or None
+
+
+def _same_amount(reference: Decimal, amount: Decimal) -> bool:
+    return abs(amount - reference) <= abs(reference) * AMOUNT_TOLERANCE
+
+
+def detect_series(charges: List) -> Optional[Dict]:
+    """
+    Find a periodic series in one merchant's charges.
+    Sorts by date, keeps charges matching the latest amount, then scans the gaps
+    between consecutive charges for a cadence most of them fit.
+    """
+    charges = sorted(charges, key=lambda charge: charge.transaction_date)
+    if len(charges) < 2:
+        return None
+    
+    reference = charges[-1].amount
+    matching = []
+    for charge in charges:
+        if not _same_amount(reference, charge.amount):
+            continue
+        # Collapse same-day duplicates
+        if matching and matching[-1].transaction_date == charge.transaction_date:
+            continue
+        matching.append(charge)
+    if len(matching) < 2:
+        return None
+    
+    intervals = [
+        (current.transaction_date - previous.transaction_date).days
+        for previous, current in zip(matching, matching[1:])
+    ]
+    median = statistics.median(intervals)
+    
+    for cadence, (low, high, step) in CADENCES.items():
+        if not low <= median <= high:
+            continue
+        regular = sum(1 for interval in intervals if low <= interval <= high)
+        if len(matching) < MIN_OCCURRENCES.get(cadence, DEFAULT_MIN_OCCURRENCES):
+            return None
+        if regular / len(intervals) < REGULARITY:
+            return None
+        last = matching[-1]
+        return {
+            "cadence": cadence,
+            "charges": matching,
+            "average_amount": (sum(c.amount for c in matching) / len(matching)).quantize(Decimal("0.01")),
+            "first_date": matching[0].transaction_date,
+            "last_date": last.transaction_date,
+            "next_expected_date": last.transaction_date + step,
+        }
+    return None
+
+
+def _save_series(db: Session, user_id, merchant_key: str, detection: Dict) -> RecurringSeries:
+    """
+    Insert or refresh a detected series and flag its transactions as recurring.
+    An upsert, so background tasks processing two charges from one merchant at once
+    both land on the same row.
+    """
+    last = detection["charges"][-1]
+    values = {
+        "description": last.description,
+        "category_id": last.category_id,
+        "cadence": detection["cadence"],
+        "average_amount": detection["average_amount"],
+        "occurrence_count": len(detection["charges"]),
+        "first_date": detection["first_date"],
+        "last_date": detection["last_date"],
+        "next_expected_date": detection["next_expected_date"],
+        "is_active": True,
+    }
+    statement = insert(RecurringSeries).values(user_id=user_id, merchant_key=merchant_key, **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "merchant_key"],
+        set_={**values, "updated_at": func.now()}
+    ).returning(RecurringSeries)
+    series = db.scalars(statement, execution_options={"populate_existing": True}).one()
+    
+    db.execute(
+        update(Transaction).where(
+            Transaction.id.in_([charge.id for charge in detection["charges"]])
+        ).values(is_recurring=True)
+    )
+    return series
+
+
+def _charge_query(db: Session, user_id):
+    return db.query(
+        Transaction.id,
+        Transaction.description,
+        Transaction.amount,
+        Transaction.transaction_date,
+        Transaction.category_id
+    ).filter(Transaction.user_id == user_id)
+
+
+def _has_ended(series: RecurringSeries, today: date) -> bool:
+    # A series that skipped two periods has probably ended
+    return (today - series.last_date).days > 2 * CADENCES[series.cadence][1]
+
+
+def deactivate_ended(db: Session, user_id, today: Optional[date] = None) -> int:
+    """Mark the user's active series that have stopped charging as inactive; caller commits."""
+    today = today or date.today()
+    ended = [
+        series.id for series in db.query(RecurringSeries).filter(
+            RecurringSeries.user_id == user_id,
+            RecurringSeries.is_active == True
+        ).all()
+        if _has_ended(series, today)
+    ]
+    if ended:
+        db.execute(
+            update(RecurringSeries).where(RecurringSeries.id.in_(ended)).values(is_active=False),
+            execution_options={"synchronize_session": False}
+        )
+    return len(ended)
+
+
+def detect_all(db: Session, user_id) -> List[RecurringSeries]:
+    """Full detection over the lookback window; used to seed a user's series and retire ended ones."""
+    since = date.today() - timedelta(days=LOOKBACK_DAYS)
+    charges_by_merchant: Dict[str, list] = {}
+    for charge in _charge_query(db, user_id).filter(Transaction.transaction_date >= since).yield_per(1000):
+        merchant_key = normalize_description(charge.description)
+        if merchant_key:
+            charges_by_merchant.setdefault(merchant_key, []).append(charge)
+    
+    detected = []
+    for merchant_key, charges in charges_by_merchant.items():
+        detection = detect_series(charges)
+        if detection:
+            detected.append(_save_series(db, user_id, merchant_key, detection))
+    db.flush()
+    deactivate_ended(db, user_id)
+    db.commit()
+    return detected
+
+
+def process_transaction(db: Session, transaction_id) -> Optional[RecurringSeries]:
+    """
+    Incrementally match one new transaction against the user's series.
+    Extends a known series when the charge arrives on schedule; otherwise checks only
+    charges with a similar amount in the lookback window for a new series.
+    """
+    transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    if transaction is None:
+        return None
+    merchant_key = normalize_description(transaction.description)
+    if merchant_key is None:
+        return None
+    
+    series = db.query(RecurringSeries).filter(
+        RecurringSeries.user_id == transaction.user_id,
+        RecurringSeries.merchant_key == merchant_key
+    ).first()
+    
+    if series is not None and transaction.transaction_date > series.last_date:
+        low, high, step = CADENCES[series.cadence]
+        gap = (transaction.transaction_date - series.last_date).days
+        # Tolerate one missed charge between observations
+        if low <= gap <= 2 * high and _same_amount(series.average_amount, transaction.amount):
+            count = series.occurrence_count or 0
+            series.average_amount = (
+                (series.average_amount * count + transaction.amount) / (count + 1)
+            ).quantize(Decimal("0.01"))
+            series.occurrence_count = count + 1
+            series.last_date = transaction.transaction_date
+            series.next_expected_date = transaction.transaction_date + step
+            series.is_active = True
+            transaction.is_recurring = True
+            db.commit()
+            return series
+    
+    # Bounded candidate scan: same user, lookback window, similar amount
+    amount = transaction.amount
+    band = abs(amount) * AMOUNT_TOLERANCE
+    candidates = _charge_query(db, transaction.user_id).filter(
+        Transaction.transaction_date >= transaction.transaction_date - timedelta(days=LOOKBACK_DAYS),
+        Transaction.transaction_date <= transaction.transaction_date,
+        Transaction.amount.between(amount - band, amount + band)
+    ).all()
+    charges = [charge for charge in candidates if normalize_description(charge.description) == merchant_key]
+    
+    detection = detect_series(charges)
+    if detection is None:
+        return None
+    series = _save_series(db, transaction.user_id, merchant_key, detection)
+    db.commit()
+    return series
+
+
+@tracer.traced("recurring.process_transaction")
+def process_transaction_in_background(user_id, transaction_id):
+    """BackgroundTasks entry point; runs after the response with its own session."""
+    db = SessionLocal()
+    db.info["user_id"] = user_id
+    try:
+        process_transaction(db, transaction_id)
+    finally:
+        db.close()
+
+
+def project_upcoming(db: Session, user_id, days: int) -> List[Dict]:
+    """
+    Expected charges from active series over the next `days` days, soonest first.
+    Read-only: series that have ended are skipped here and retired by detect_all.
+    """
+    today = date.today()
+    horizon = today + timedelta(days=days)
+    series_list = db.query(RecurringSeries).filter(
+        RecurringSeries.user_id == user_id,
+        RecurringSeries.is_active == True,
+        RecurringSeries.next_expected_date <= horizon
+    ).all()
+    
+    upcoming = []
+    for series in series_list:
+        if _has_ended(series, today):
+            continue
+        step = CADENCES[series.cadence][2]
+        due = series.next_expected_date
+        while due < today:
+            due += step
+        while due <= horizon:
+            upcoming.append({
+                "series": series,
+                "due_date": due,
+                "amount": series.average_amount,
+            })
+            due += step
+    
+    upcoming.sort(key=lambda charge: charge["due_date"])
+    return upcoming
+
+
+def create_bill_reminders(db: Session, user_id, days: int = 3) -> List[Alert]:
+    """Create one bill_reminder alert per series due within `days`, skipping ones already sent."""
+    alerts = []
+    seen = set()
+    for charge in project_upcoming(db, user_id, days):
+        series = charge["series"]
+        # Only the next charge of each series gets a reminder
+        if series.id in seen:
+            continue
+        seen.add(series.id)
+        if series.reminded_for_date == charge["due_date"]:
+            continue
+        series.reminded_for_date = charge["due_date"]
+        alert = Alert(
+            user_id=user_id,
+            alert_type="bill_reminder",
+            title=f"Upcoming bill: {series.description or series.merchant_key}",
+            message=(
+                f"About ${charge['amount']:.2f} is expected on "
+                f"{charge['due_date'].isoformat()} ({series.cadence})."
+            ),
+            severity="info"
+        )
+        db.add(alert)
+        alerts.append(alert)
+    db.commit()
+    return alerts
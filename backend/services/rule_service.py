@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.category_rule import CategoryRule
+from utils.aho_corasick import AhoCorasick
+
+
+class RuleEngine:
+    """
+    Applies users' "description contains" category rules.
+    Each user's rules are compiled into one Aho-Corasick automaton, cached until
+    the rules change, so matching costs one pass over the description however
+    many rules the user has.
+    """
+    
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._matchers: "OrderedDict[str, Tuple[tuple, AhoCorasick]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _compile(self, db: Session, user_id) -> AhoCorasick:
+        rules = db.query(CategoryRule.pattern, CategoryRule.category_id).filter(
+            CategoryRule.user_id == user_id
+        ).order_by(CategoryRule.priority.desc(), CategoryRule.created_at).all()
+        return AhoCorasick((rule.pattern.lower(), rule.category_id) for rule in rules)
+    
+    def _version(self, db: Session, user_id) -> tuple:
+        """
+        Rule count and latest change of the user's rules, so edits made through any
+        worker are seen. Read once per session: a request matching many transactions
+        pays for one query.
+        """
+        versions = db.info.setdefault("rule_set_versions", {})
+        key = str(user_id)
+        if key not in versions:
+            versions[key] = tuple(db.query(
+                func.count(CategoryRule.id),
+                func.max(CategoryRule.updated_at)
+            ).filter(CategoryRule.user_id == user_id).one())
+        return versions[key]
+    
+    def get_matcher(self, db: Session, user_id) -> AhoCorasick:
+        key = str(user_id)
+        # Read the version before compiling so a concurrent edit makes the result stale, not wrong
+        version = self._version(db, user_id)
+        with self._lock:
+            cached = self._matchers.get(key)
+            if cached is not None and cached[0] == version:
+                self._matchers.move_to_end(key)
+                return cached[1]
+        
+        matcher = self._compile(db, user_id)
+        with self._lock:
+            self._matchers[key] = (version, matcher)
+            self._matchers.move_to_end(key)
+            while len(self._matchers) > self.max_users:
+                self._matchers.popitem(last=False)
+        return matcher
+    
+    def invalidate(self, user_id):
+        """Drop a user's compiled rules from this worker, e.g. once the account is purged."""
+        with self._lock:
+            self._matchers.pop(str(user_id), None)
+    
+    def match(self, db: Session, user_id, description: Optional[str]):
+        """Category id of the highest-priority rule matching the description, or None."""
+        if not description:
+            return None
+        return self.get_matcher(db, user_id).best_match(description.lower())
+
+
+rule_engine = RuleEngine()
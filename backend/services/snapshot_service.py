@@ -0,0 +1,180 @@
+"""
+Compact per-user financial snapshot used as context for every AI call.
+
+A snapshot is built from a handful of grouped queries, independent of how many budgets
+or transactions the user has, and cached per worker until the user's data version
+(user_write_stamps.data_version, bumped after each commit that writes the user's data)
+or the date changes, or AI_SNAPSHOT_CACHE_TTL_SECONDS pass.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from config import settings
+from models.budget import Budget
+from models.category import Category
+from models.recurring_series import RecurringSeries
+from models.transaction import Transaction
+from models.user import FinancialProfile, UserWriteStamp
+from utils.tracing import tracer
+
+TRAILING_MONTHS = 3
+LARGE_TRANSACTION_DAYS = 30
+LARGE_TRANSACTION_COUNT = 5
+UNCATEGORIZED = "Uncategorized"
+
+
+def _money(value) -> float:
+    return round(float(value or 0), 2)
+
+
+@tracer.traced("snapshot.build")
+def build_snapshot(db: Session, user_id, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Income, budgets, month-to-date and trailing spend per category, recent large
+    transactions and active recurring charges, as JSON-ready values.
+    """
+    today = today or date.today()
+    month_start = date(today.year, today.month, 1)
+    trailing_start = month_start - relativedelta(months=TRAILING_MONTHS)
+    
+    profile = db.query(FinancialProfile).filter(FinancialProfile.user_id == user_id).first()
+    
+    budgets = db.query(Budget, Category.name).join(
+        Category, Category.id == Budget.category_id
+    ).filter(Budget.user_id == user_id).all()
+    
+    # Month-to-date and trailing spend for every category in one grouped query
+    spend_rows = db.query(
+        Category.name,
+        func.sum(case((Transaction.transaction_date >= month_start, Transaction.amount), else_=0)),
+        func.sum(case((Transaction.transaction_date < month_start, Transaction.amount), else_=0)),
+        func.avg(Transaction.amount),
+        func.count(Transaction.id)
+    ).select_from(Transaction).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).filter(
+        and_(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date >= trailing_start,
+            Transaction.transaction_date <= today
+        )
+    ).group_by(Category.name).all()
+    
+    large = db.query(
+        Transaction.transaction_date, Transaction.amount, Transaction.description, Category.name
+    ).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).filter(
+        and_(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date >= today - relativedelta(days=LARGE_TRANSACTION_DAYS),
+            Transaction.transaction_date <= today
+        )
+    ).order_by(Transaction.amount.desc()).limit(LARGE_TRANSACTION_COUNT).all()
+    
+    recurring = db.query(RecurringSeries, Category.name).outerjoin(
+        Category, Category.id == RecurringSeries.category_id
+    ).filter(
+        and_(RecurringSeries.user_id == user_id, RecurringSeries.is_active == True)
+    ).order_by(RecurringSeries.next_expected_date).all()
+    
+    spending = {
+        (name or UNCATEGORIZED): {
+            "month_to_date": _money(month_to_date),
+            "trailing_monthly_average": _money(Decimal(trailing or 0) / TRAILING_MONTHS),
+            "average_transaction": _money(average),
+            "transactions": count,
+        }
+        for name, month_to_date, trailing, average, count in spend_rows
+    }
+    
+    return {
+        "as_of": today.isoformat(),
+        "currency": profile.currency if profile and profile.currency else "USD",
+        "monthly_income": _money(profile.monthly_income if profile else 0),
+        "current_savings": _money(profile.current_savings if profile else 0),
+        "budgets": {
+            name: {
+                "limit": _money(budget.monthly_limit),
+                "period": budget.budget_period,
+                "spent_this_month": spending.get(name, {}).get("month_to_date", 0.0),
+            }
+            for budget, name in budgets
+        },
+        "spending": spending,
+        "large_transactions": [
+            {
+                "date": txn_date.isoformat(),
+                "amount": _money(amount),
+                "description": description or "",
+                "category": name or UNCATEGORIZED,
+            }
+            for txn_date, amount, description, name in large
+        ],
+        "recurring_charges": [
+            {
+                "description": series.description or series.merchant_key,
+                "category": name or UNCATEGORIZED,
+                "amount": _money(series.average_amount),
+                "cadence": series.cadence,
+                "next_expected_date": series.next_expected_date.isoformat(),
+            }
+            for series, name in recurring
+        ],
+    }
+
+
+def budget_limits(snapshot: Dict[str, Any]) -> Dict[str, Decimal]:
+    """Budget limit per category name, as the AIService methods expect."""
+    return {name: Decimal(str(budget["limit"])) for name, budget in snapshot["budgets"].items()}
+
+
+def data_version(db: Session, user_id) -> int:
+    """The user's data version as seen by this session."""
+    return db.query(UserWriteStamp.data_version).filter(UserWriteStamp.user_id == user_id).scalar() or 0
+
+
+class SnapshotCache:
+    """Latest snapshot per user, valid while the user's data version and the date are unchanged."""
+    
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def get(self, db: Session, user_id, today: Optional[date] = None) -> Dict[str, Any]:
+        today = today or date.today()
+        key = str(user_id)
+        # Read the version before building so a concurrent write makes the result stale, not wrong
+        version = data_version(db, user_id)
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if (
+                cached is not None
+                and cached[0] == version
+                and cached[1] == today
+                and time.monotonic() - cached[2] < settings.AI_SNAPSHOT_CACHE_TTL_SECONDS
+            ):
+                self._snapshots.move_to_end(key)
+                return cached[3]
+        
+        snapshot = build_snapshot(db, user_id, today)
+        with self._lock:
+            self._snapshots[key] = (version, today, time.monotonic(), snapshot)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_users:
+                self._snapshots.popitem(last=False)
+        return snapshot
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._snapshots.pop(str(user_id), None)
+
+
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules under test read settings at import time; unit tests never connect to a database
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/budget_app_test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
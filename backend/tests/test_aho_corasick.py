@@ -0,0 +1,47 @@
+from utils.aho_corasick import AhoCorasick
+
+
+def test_no_keywords_matches_nothing():
+    assert AhoCorasick([]).best_match("anything") is None
+
+
+def test_no_match():
+    matcher = AhoCorasick([("coffee", 1), ("fuel", 2)])
+    assert matcher.best_match("grocery store") is None
+    assert matcher.best_match("") is None
+
+
+def test_first_keyword_given_wins():
+    matcher = AhoCorasick([("fuel", "high"), ("coffee", "low")])
+    assert matcher.best_match("coffee and fuel") == "high"
+    assert matcher.best_match("coffee only") == "low"
+
+
+def test_overlapping_keywords():
+    # "he" and "she" end at the same position, "hers" extends "he"
+    matcher = AhoCorasick([("hers", "hers"), ("she", "she"), ("he", "he")])
+    assert matcher.best_match("ushers") == "hers"
+    assert matcher.best_match("ushe") == "she"
+    assert matcher.best_match("the") == "he"
+
+
+def test_keyword_found_through_fail_link():
+    # The lower-priority keyword is a suffix of a longer partial match
+    matcher = AhoCorasick([("xyz", "long"), ("bc", "suffix")])
+    assert matcher.best_match("abcd") == "suffix"
+    assert matcher.best_match("xyabc") == "suffix"
+
+
+def test_suffix_keyword_outranks_containing_keyword():
+    matcher = AhoCorasick([("bucks", "bucks"), ("starbucks", "starbucks")])
+    assert matcher.best_match("starbucks 123") == "bucks"
+
+
+def test_duplicate_keyword_keeps_first_value():
+    matcher = AhoCorasick([("shell", "first"), ("shell", "second")])
+    assert matcher.best_match("shell oil") == "first"
+
+
+def test_is_case_sensitive():
+    # The rule engine lowercases both sides before matching
+    assert AhoCorasick([("coffee", 1)]).best_match("COFFEE") is None
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+import pytest
+from services.budget_service import BUDGET_PERIODS, period_bounds
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2024, 1, 1), (date(2024, 1, 1), date(2024, 2, 1))),
+    (date(2024, 1, 31), (date(2024, 1, 1), date(2024, 2, 1))),
+    (date(2024, 2, 29), (date(2024, 2, 1), date(2024, 3, 1))),
+    (date(2023, 2, 28), (date(2023, 2, 1), date(2023, 3, 1))),
+    (date(2024, 12, 31), (date(2024, 12, 1), date(2025, 1, 1))),
+])
+def test_monthly(day, expected):
+    assert period_bounds("monthly", day) == expected
+
+
+def test_unknown_period_is_monthly():
+    assert period_bounds("fortnightly", date(2024, 4, 30)) == (date(2024, 4, 1), date(2024, 5, 1))
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2024, 4, 29), (date(2024, 4, 29), date(2024, 5, 6))),  # Monday
+    (date(2024, 5, 5), (date(2024, 4, 29), date(2024, 5, 6))),   # Sunday
+    (date(2024, 12, 31), (date(2024, 12, 30), date(2025, 1, 6))),
+])
+def test_weekly_starts_on_monday(day, expected):
+    assert period_bounds("weekly", day) == expected
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2024, 1, 1), (date(2024, 1, 1), date(2024, 4, 1))),
+    (date(2024, 3, 31), (date(2024, 1, 1), date(2024, 4, 1))),
+    (date(2024, 6, 30), (date(2024, 4, 1), date(2024, 7, 1))),
+    (date(2024, 12, 31), (date(2024, 10, 1), date(2025, 1, 1))),
+])
+def test_quarterly(day, expected):
+    assert period_bounds("quarterly", day) == expected
+
+
+def test_yearly():
+    assert period_bounds("yearly", date(2024, 2, 29)) == (date(2024, 1, 1), date(2025, 1, 1))
+
+
+@pytest.mark.parametrize("budget_period", BUDGET_PERIODS)
+def test_periods_tile_without_gaps(budget_period):
+    start, end = period_bounds(budget_period, date(2023, 11, 15))
+    for _ in range(30):
+        assert start < end
+        # The last day belongs to the period, the end (exclusive) starts the next one
+        assert period_bounds(budget_period, end - timedelta(days=1)) == (start, end)
+        next_start, next_end = period_bounds(budget_period, end)
+        assert next_start == end
+        start, end = next_start, next_end
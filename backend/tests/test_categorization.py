@@ -0,0 +1,53 @@
+import pytest
+from services.categorization_service import NaiveBayesModel, extract_features
+
+
+def _trained() -> NaiveBayesModel:
+    model = NaiveBayesModel()
+    for description in ("starbucks coffee", "blue bottle coffee", "coffee bean"):
+        model.learn(extract_features(description, "card", 5), "coffee")
+    for description in ("shell fuel", "chevron fuel station", "bp fuel"):
+        model.learn(extract_features(description, "card", 60), "fuel")
+    return model
+
+
+def test_extract_features():
+    assert extract_features("STARBUCKS #123 Coffee", "Card", 4) == ["starbucks", "coffee", "pm:card", "amt:2"]
+    assert extract_features(None, None, None) == []
+
+
+def test_predicts_most_likely_label():
+    model = _trained()
+    label, confidence = model.predict(extract_features("corner coffee", "card", 6))
+    assert label == "coffee"
+    assert 0.5 < confidence <= 1.0
+    label, _ = model.predict(extract_features("shell", "card", 55))
+    assert label == "fuel"
+
+
+def test_empty_model_or_features_predict_nothing():
+    assert NaiveBayesModel().predict(["coffee"]) == (None, 0.0)
+    assert _trained().predict([]) == (None, 0.0)
+
+
+def test_single_label_is_certain():
+    model = NaiveBayesModel()
+    model.learn(["rent"], "housing")
+    assert model.predict(["anything"]) == ("housing", pytest.approx(1.0))
+
+
+def test_forget_undoes_learn():
+    model = _trained()
+    features = extract_features("tea house", "cash", 3)
+    model.learn(features, "tea")
+    model.forget(features, "tea")
+    assert "tea" not in model.class_counts
+    assert "tea" not in model.feature_counts
+    assert "house" not in model.vocabulary
+    assert model.examples == 6
+
+
+def test_forget_unknown_label_is_ignored():
+    model = _trained()
+    model.forget(["coffee"], "groceries")
+    assert model.examples == 6
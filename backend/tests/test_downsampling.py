@@ -0,0 +1,48 @@
+from utils.downsampling import lttb
+
+
+def test_empty_series():
+    assert lttb([], [], 10) == []
+
+
+def test_series_shorter_than_max_points_is_unchanged():
+    points = ["a", "b", "c"]
+    assert lttb(points, [1, 2, 3], 5) == points
+    assert lttb(points, [1, 2, 3], 3) == points
+
+
+def test_max_points_below_three_returns_everything():
+    points = list(range(10))
+    assert lttb(points, points, 2) == points
+    assert lttb(points, points, 0) == points
+
+
+def test_returns_copy():
+    points = [1, 2]
+    result = lttb(points, [1.0, 2.0], 10)
+    assert result == points
+    assert result is not points
+
+
+def test_keeps_endpoints_and_size():
+    points = list(range(100))
+    values = [float(i % 7) for i in points]
+    result = lttb(points, values, 10)
+    assert len(result) == 10
+    assert result[0] == 0
+    assert result[-1] == 99
+    assert result == sorted(result)
+
+
+def test_preserves_spike():
+    points = list(range(50))
+    values = [0.0] * 50
+    values[23] = 100.0
+    assert 23 in lttb(points, values, 5)
+
+
+def test_preserves_dip():
+    points = list(range(50))
+    values = [10.0] * 50
+    values[31] = -50.0
+    assert 31 in lttb(points, values, 6)
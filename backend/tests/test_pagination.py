@@ -0,0 +1,70 @@
+import base64
+import uuid
+from datetime import date
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+from models.transaction import Transaction
+from utils.pagination import decode_cursor, encode_cursor, paginate
+
+
+def test_round_trip_stringifies_values():
+    row_id = uuid.uuid4()
+    cursor = encode_cursor([date(2024, 1, 31), row_id])
+    assert decode_cursor(cursor, 2) == ["2024-01-31", str(row_id)]
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(["0.0607927", "a/b+c"])
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def test_wrong_size_is_rejected():
+    cursor = encode_cursor(["2024-01-31", "x"])
+    assert decode_cursor(cursor, 3) is None
+    assert decode_cursor(cursor, 1) is None
+
+
+def _encode_raw(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def test_malformed_cursors_are_rejected():
+    assert decode_cursor("", 2) is None
+    assert decode_cursor("not a cursor!", 2) is None
+    assert decode_cursor("é", 2) is None
+    assert decode_cursor(_encode_raw(b"\xff\xfe"), 2) is None
+    assert decode_cursor(_encode_raw(b"{not json"), 2) is None
+
+
+def test_wrong_shape_is_rejected():
+    assert decode_cursor(_encode_raw(b'{"a": "b"}'), 1) is None
+    assert decode_cursor(_encode_raw(b'"ab"'), 2) is None
+    assert decode_cursor(_encode_raw(b'["a", 1]'), 2) is None
+    assert decode_cursor(_encode_raw(b'["a", null]'), 2) is None
+
+
+SORT_KEYS = [Transaction.transaction_date, Transaction.id]
+
+
+def _sql(query) -> str:
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_offset_page_is_ordered_then_skipped():
+    sql = _sql(paginate(Query(Transaction), SORT_KEYS, 50, offset=100))
+    assert "ORDER BY transactions.transaction_date DESC, transactions.id DESC" in sql
+    assert sql.index("ORDER BY") < sql.index("LIMIT") < sql.index("OFFSET")
+
+
+def test_first_page_has_no_offset():
+    sql = _sql(paginate(Query(Transaction), SORT_KEYS, 50))
+    assert "LIMIT" in sql
+    assert "OFFSET" not in sql
+
+
+def test_cursor_page_filters_and_ignores_offset():
+    after = [date(2024, 1, 31), uuid.uuid4()]
+    sql = _sql(paginate(Query(Transaction), SORT_KEYS, 50, after=after, offset=100))
+    assert "(transactions.transaction_date, transactions.id) <" in sql
+    assert "OFFSET" not in sql
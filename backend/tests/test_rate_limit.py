@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from utils import rate_limit
+from utils.rate_limit import MemoryBackend, parse_rules
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake)
+    return fake
+
+
+def acquire(backend, key="k", capacity=3, rate=1.0):
+    return asyncio.run(backend.acquire(key, capacity, rate))
+
+
+def test_burst_up_to_capacity_then_wait(clock):
+    backend = MemoryBackend()
+    assert [acquire(backend) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert acquire(backend) == pytest.approx(1.0)
+
+
+def test_refill_over_time(clock):
+    backend = MemoryBackend()
+    for _ in range(3):
+        acquire(backend, rate=0.5)
+    assert acquire(backend, rate=0.5) == pytest.approx(2.0)
+    clock.now += 2.0
+    assert acquire(backend, rate=0.5) == 0.0
+    assert acquire(backend, rate=0.5) == pytest.approx(2.0)
+
+
+def test_partial_refill_shortens_wait(clock):
+    backend = MemoryBackend()
+    for _ in range(3):
+        acquire(backend)
+    clock.now += 0.25
+    assert acquire(backend) == pytest.approx(0.75)
+
+
+def test_refill_is_capped_at_capacity(clock):
+    backend = MemoryBackend()
+    acquire(backend)
+    clock.now += 3600
+    assert [acquire(backend) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert acquire(backend) > 0
+
+
+def test_keys_are_independent(clock):
+    backend = MemoryBackend()
+    for _ in range(3):
+        acquire(backend, key="a")
+    assert acquire(backend, key="a") > 0
+    assert acquire(backend, key="b") == 0.0
+
+
+def test_full_buckets_are_evicted(clock):
+    backend = MemoryBackend(max_keys=2)
+    acquire(backend, key="a")
+    acquire(backend, key="b")
+    clock.now += 10
+    acquire(backend, key="c")
+    assert set(backend._buckets) == {"c"}
+
+
+def test_parse_rules():
+    rules = parse_rules("post /api/ai/ask/=20/60, GET /=5/1")
+    assert rules == {
+        ("POST", "/api/ai/ask"): (20, pytest.approx(20 / 60)),
+        ("GET", "/"): (5, 5.0),
+    }
+    assert parse_rules("") == {}
+
+
+@pytest.mark.parametrize("spec", ["POST /x=0/60", "POST /x=5/0", "POST /x=five/60"])
+def test_parse_rules_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_rules(spec)
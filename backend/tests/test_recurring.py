@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from dateutil.relativedelta import relativedelta
+from services.recurring_service import detect_series, normalize_description
+
+
+def _charges(start: date, step, count: int, amount="9.99"):
+    return [
+        SimpleNamespace(transaction_date=start + step * i, amount=Decimal(amount))
+        for i in range(count)
+    ]
+
+
+def test_normalize_description():
+    assert normalize_description("NETFLIX.COM 866-579-7172 CA") == "netflix ca"
+    assert normalize_description("POS PURCHASE Spotify USA #12345") == "spotify usa"
+    assert normalize_description("1234 5678") is None
+    assert normalize_description(None) is None
+
+
+def test_monthly_series():
+    charges = _charges(date(2024, 1, 15), relativedelta(months=1), 4)
+    detection = detect_series(charges)
+    assert detection["cadence"] == "monthly"
+    assert detection["first_date"] == date(2024, 1, 15)
+    assert detection["last_date"] == date(2024, 4, 15)
+    assert detection["next_expected_date"] == date(2024, 5, 15)
+    assert detection["average_amount"] == Decimal("9.99")
+
+
+def test_month_end_charges_stay_monthly():
+    charges = _charges(date(2024, 1, 31), relativedelta(months=1), 4)
+    detection = detect_series(charges)
+    assert detection["cadence"] == "monthly"
+    assert detection["last_date"] == date(2024, 4, 30)
+
+
+def test_weekly_series_in_any_order():
+    charges = _charges(date(2024, 3, 1), timedelta(weeks=1), 5)
+    assert detect_series(list(reversed(charges)))["cadence"] == "weekly"
+
+
+def test_annual_series_needs_two_charges():
+    charges = _charges(date(2022, 6, 1), relativedelta(years=1), 2, amount="99.00")
+    assert detect_series(charges)["cadence"] == "annual"
+
+
+def test_too_few_charges():
+    assert detect_series([]) is None
+    assert detect_series(_charges(date(2024, 1, 1), relativedelta(months=1), 1)) is None
+    assert detect_series(_charges(date(2024, 1, 1), relativedelta(months=1), 2)) is None
+
+
+def test_irregular_gaps_are_not_a_series():
+    charges = [
+        SimpleNamespace(transaction_date=day, amount=Decimal("20"))
+        for day in (date(2024, 1, 1), date(2024, 1, 5), date(2024, 2, 20), date(2024, 3, 1), date(2024, 5, 30))
+    ]
+    assert detect_series(charges) is None
+
+
+def test_amount_change_keeps_charges_near_latest_amount():
+    charges = _charges(date(2023, 1, 10), relativedelta(months=1), 3, amount="10.00")
+    charges += _charges(date(2023, 4, 10), relativedelta(months=1), 3, amount="15.00")
+    detection = detect_series(charges)
+    assert [c.amount for c in detection["charges"]] == [Decimal("15.00")] * 3
+    assert detection["first_date"] == date(2023, 4, 10)
+
+
+def test_same_day_duplicates_collapse():
+    charges = _charges(date(2024, 1, 1), relativedelta(months=1), 3)
+    charges.append(SimpleNamespace(transaction_date=date(2024, 2, 1), amount=Decimal("9.99")))
+    detection = detect_series(charges)
+    assert len(detection["charges"]) == 3
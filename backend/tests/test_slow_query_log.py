@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from database import _discard_slow_query_timer, _record_slow_query, _start_slow_query_timer
+
+
+@pytest.fixture
+def timed_engine():
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", _start_slow_query_timer)
+    event.listen(engine, "after_cursor_execute", _record_slow_query)
+    event.listen(engine, "handle_error", _discard_slow_query_timer)
+    yield engine
+    engine.dispose()
+
+
+def test_successful_statement_pops_its_start_time(timed_engine):
+    with timed_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert conn.info["slow_query_start"] == []
+
+
+def test_failed_statement_leaves_no_start_time(timed_engine):
+    with timed_engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["slow_query_start"] == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["slow_query_start"] == []
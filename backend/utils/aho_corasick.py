@@ -0,0 +1,67 @@
+from collections import deque
+from typing import Generic, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Multi-pattern substring matcher.
+    Keywords are given in priority order; best_match returns the value of the
+    highest-priority keyword found in a text in a single pass over the text,
+    regardless of how many keywords the automaton holds.
+    """
+    
+    def __init__(self, keywords: Iterable[Tuple[str, T]]):
+        self._goto = [{}]
+        self._fail = [0]
+        # Best (lowest) priority rank ending at each node, including via fail links
+        self._best: list[Optional[int]] = [None]
+        self._values: list[T] = []
+        
+        for rank, (keyword, value) in enumerate(keywords):
+            self._values.append(value)
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = next_node
+            if self._best[node] is None:
+                self._best[node] = rank
+        
+        self._build_fail_links()
+    
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+    
+    def best_match(self, text: str) -> Optional[T]:
+        """Value of the highest-priority keyword occurring in text, or None."""
+        best = None
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            rank = self._best[node]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+                if best == 0:
+                    break
+        return self._values[best] if best is not None else None
@@ -0,0 +1,43 @@
+from typing import Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def lttb(points: Sequence[T], values: Sequence[float], max_points: int) -> list[T]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with its neighbours, which preserves peaks and dips.
+    `values` holds the y-value of each point; x is the point's position.
+    """
+    count = len(points)
+    if max_points >= count or max_points < 3:
+        return list(points)
+    
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (max_points - 2)
+    selected = 0
+    
+    for i in range(max_points - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        next_len = next_end - next_start
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / next_len
+        
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = selected, values[selected]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        sampled.append(points[best])
+        selected = best
+    
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Any, Optional, Sequence
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the sort-key values of the last row on a page as an opaque cursor."""
+    raw = json.dumps([str(value) for value in values]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[list[str]]:
+    """Decode a cursor into its sort-key values (as strings), or None if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        return None
+    return values
+
+
+def paginate(query: Query, sort_keys: Sequence, limit: int, after: Optional[list] = None, offset: int = 0) -> Query:
+    """
+    Order by `sort_keys` descending and fetch `limit + 1` rows, the extra one telling
+    whether another page exists. Rows come after the cursor values `after` when given,
+    otherwise `offset` rows are skipped.
+    """
+    if after is not None:
+        query = query.filter(tuple_(*sort_keys) < tuple_(*after))
+    # OFFSET must follow ORDER BY: Query refuses order_by() once an offset is set
+    query = query.order_by(*[key.desc() for key in sort_keys]).limit(limit + 1)
+    if after is None and offset:
+        query = query.offset(offset)
+    return query
@@ -0,0 +1,171 @@
+"""
+Per-user token-bucket rate limiting for expensive endpoints.
+
+Each limited route gets one bucket per caller (the JWT subject, or the client address
+for anonymous requests). Buckets live in process memory by default, or in Redis when
+RATE_LIMIT_REDIS_URL is set so every worker shares the same budget.
+"""
+import json
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from utils.metrics import REGISTRY, Counter
+from utils.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED = REGISTRY.register(Counter(
+    "http_requests_rate_limited_total", "Requests rejected by the rate limiter", ("method", "route")
+))
+
+
+def parse_rules(spec: str) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    """
+    Parse "METHOD /path=burst/seconds, ..." into {(method, path): (capacity, refill_per_second)}.
+    A rule of 5/60 allows bursts of 5 requests and refills the bucket over a minute.
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, limit = item.partition("=")
+        method, _, path = route.strip().partition(" ")
+        burst, _, seconds = limit.partition("/")
+        capacity = int(burst)
+        if capacity <= 0 or float(seconds) <= 0:
+            raise ValueError(f"Invalid rate limit rule: {item!r}")
+        rules[(method.upper(), path.strip().rstrip("/") or "/")] = (capacity, capacity / float(seconds))
+    return rules
+
+
+class MemoryBackend:
+    """Buckets in this process only; each worker enforces its own limit."""
+    
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last update, time the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+    
+    def _evict(self, now: float):
+        # Buckets that have refilled completely are indistinguishable from new ones
+        self._buckets = {key: state for key, state in self._buckets.items() if state[2] > now}
+    
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token; returns 0 when allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._evict(now)
+            return wait
+
+
+# Refill and take a token atomically; the key expires once the bucket would be full again
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared by every worker through Redis; requires the redis package."""
+    
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio
+        self.client = redis.asyncio.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+    
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[capacity, rate, time.time()])
+        return float(wait)
+
+
+def _caller(scope) -> str:
+    headers = dict(scope.get("headers") or [])
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_token(token)
+        if payload and payload.get("sub"):
+            return "user:" + payload["sub"]
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a caller's bucket for a route is empty."""
+    
+    def __init__(self, app, rules: Dict[Tuple[str, str], Tuple[int, float]], backend=None):
+        self.app = app
+        self.rules = rules
+        self.backend = backend or MemoryBackend()
+    
+    async def __call__(self, scope, receive, send):
+        rule = None
+        if scope["type"] == "http":
+            path = scope["path"].rstrip("/") or "/"
+            rule = self.rules.get((scope["method"], path))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        
+        capacity, rate = rule
+        key = f"{scope['method']} {path}|{_caller(scope)}"
+        try:
+            wait = await self.backend.acquire(key, capacity, rate)
+        except Exception:
+            # A broken shared backend must not take the endpoints down with it
+            logger.exception("Rate limit backend failed; allowing request")
+            wait = 0.0
+        
+        if wait <= 0:
+            await self.app(scope, receive, send)
+            return
+        
+        RATE_LIMITED.inc(method=scope["method"], route=path)
+        retry_after = str(max(1, math.ceil(wait)))
+        body = json.dumps({"detail": f"Rate limit exceeded. Try again in {retry_after} seconds."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_rate_limiter(settings) -> Optional[dict]:
+    """Middleware options from settings, or None when rate limiting is disabled."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    rules = parse_rules(settings.RATE_LIMIT_RULES)
+    if not rules:
+        return None
+    backend = RedisBackend(settings.RATE_LIMIT_REDIS_URL) if settings.RATE_LIMIT_REDIS_URL else MemoryBackend()
+    return {"rules": rules, "backend": backend}
@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import Any, Iterable, Sequence, Type
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        # Match Pydantic's JSON output, which renders Decimal as a string
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson (Decimal/UUID/date aware)."""
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson, bypassing response_model validation."""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def response_columns(model: Any, schema: Type[BaseModel]) -> tuple[list[str], list[Any]]:
+    """Return the field names of a response schema and the matching model columns."""
+    fields = list(schema.model_fields)
+    return fields, [getattr(model, field) for field in fields]
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+    """Zip column tuples into dicts keyed by field name."""
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,335 @@
+"""
+Lightweight tracing with an OpenTelemetry-compatible span model.
+
+Spans are exported as OTLP/JSON, either one span per line to a local file or in
+batches to an OTLP/HTTP collector. The current span lives in a context variable, so
+it follows requests into the threadpool and into BackgroundTasks.
+"""
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+MAX_STATEMENT_LENGTH = 2000
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    __slots__ = (
+        "tracer", "name", "kind", "trace_id", "span_id", "parent_span_id", "sampled",
+        "attributes", "start_ns", "end_ns", "status_code", "status_message",
+    )
+    
+    def __init__(self, tracer, name: str, kind: int, trace_id: str, parent_span_id: Optional[str], sampled: bool, attributes: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status_code = STATUS_OK
+        self.status_message = ""
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+    
+    def record_exception(self, exc: BaseException):
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+        self.attributes["exception.type"] = type(exc).__name__
+    
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            self.tracer.export(self)
+    
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+    
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class JsonLinesExporter:
+    """Appends one OTLP/JSON span per line to a local file."""
+    
+    def __init__(self, path: str, service_name: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.service_name = service_name
+    
+    def export(self, spans: List[Span]):
+        with open(self.path, "a") as f:
+            for span in spans:
+                f.write(json.dumps({"service.name": self.service_name, **span.to_otlp()}) + "\n")
+
+
+class OTLPHttpExporter:
+    """Posts batches of spans to an OTLP/HTTP JSON endpoint (e.g. a collector on :4318)."""
+    
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+    
+    def export(self, spans: List[Span]):
+        body = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{"scope": {"name": "budgeting-assistant"}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }).encode()
+        request = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class BatchSpanProcessor:
+    """Exports finished spans from a background thread; drops spans when the queue is full."""
+    
+    def __init__(self, exporter, max_queue_size: int = 2048, batch_size: int = 256, interval: float = 2.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+    
+    def on_end(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+    
+    def _drain(self) -> List[Span]:
+        spans = []
+        while len(spans) < self.batch_size:
+            try:
+                spans.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return spans
+    
+    def flush(self):
+        with self._flush_lock:
+            while True:
+                spans = self._drain()
+                if not spans:
+                    return
+                try:
+                    self.exporter.export(spans)
+                except Exception:
+                    # Tracing must never break the application
+                    pass
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+class Tracer:
+    def __init__(self):
+        self.processor: Optional[BatchSpanProcessor] = None
+        self.sample_rate = 1.0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+    
+    def configure(self, exporter, sample_rate: float = 1.0):
+        self.processor = BatchSpanProcessor(exporter)
+        self.sample_rate = sample_rate
+    
+    def export(self, span: Span):
+        if self.processor is not None:
+            self.processor.on_end(span)
+    
+    def create_span(self, name: str, kind: int = INTERNAL, attributes: Optional[dict] = None, traceparent: Optional[str] = None) -> Span:
+        """Start a span under the current span, a remote traceparent, or as a new root."""
+        parent = current_span.get()
+        remote = TRACEPARENT.match(traceparent or "") if parent is None else None
+        if parent is not None:
+            return Span(self, name, kind, parent.trace_id, parent.span_id, parent.sampled, attributes)
+        if remote:
+            return Span(self, name, kind, remote.group(1), remote.group(2), remote.group(3) == "01", attributes)
+        sampled = random.random() < self.sample_rate
+        return Span(self, name, kind, os.urandom(16).hex(), None, sampled, attributes)
+    
+    @contextmanager
+    def start_span(self, name: str, kind: int = INTERNAL, attributes: Optional[dict] = None):
+        if not self.enabled:
+            yield None
+            return
+        span = self.create_span(name, kind, attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+    
+    def traced(self, name: Optional[str] = None, kind: int = INTERNAL):
+        """Decorator running a function inside a span."""
+        def decorator(func):
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.start_span(span_name, kind):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+tracer = Tracer()
+
+
+def set_span_attribute(key: str, value: Any):
+    """Annotate the current span, if any."""
+    span = current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    if current_span.get() is None:
+        return
+    span = tracer.create_span("db.query", CLIENT, {
+        "db.system": conn.engine.dialect.name,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+    })
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        spans.pop().end()
+
+
+def _fail_statement_span(exception_context):
+    spans = exception_context.connection.info.get("trace_spans") if exception_context.connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.end()
+
+
+def instrument_engine(engine):
+    """Record a span for every SQL statement run inside a traced operation."""
+    event.listen(engine, "before_cursor_execute", _start_statement_span)
+    event.listen(engine, "after_cursor_execute", _end_statement_span)
+    event.listen(engine, "handle_error", _fail_statement_span)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per request, honouring an incoming traceparent."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope.get("headers") or [])
+        span = tracer.create_span(
+            f"{scope['method']} {scope['path']}", SERVER,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            traceparent=headers.get(b"traceparent", b"").decode("latin-1"),
+        )
+        token = current_span.set(span)
+        
+        def finish():
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("http.route", route)
+            span.end()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status_code = STATUS_ERROR
+            await send(message)
+            # End when the response is sent; background tasks run afterwards as child spans
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            finish()
+
+
+def configure_tracing(settings):
+    """Enable tracing from settings; a no-op unless TRACING_ENABLED is set."""
+    if not settings.TRACING_ENABLED or tracer.enabled:
+        return
+    if settings.TRACING_EXPORTER == "otlp":
+        exporter = OTLPHttpExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+    else:
+        exporter = JsonLinesExporter(settings.TRACING_JSONL_PATH, settings.TRACING_SERVICE_NAME)
+    tracer.configure(exporter, settings.TRACING_SAMPLE_RATE)
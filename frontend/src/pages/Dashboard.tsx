@@ -2,10 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { Plus, TrendingUp, AlertCircle, DollarSign, Brain } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
-import { budgetService } from '../services/budget';
-import { transactionService } from '../services/transactions';
-import { aiService } from '../services/ai';
-import { alertService } from '../services/alerts';
+import { dashboardService } from '../services/dashboard';
 import { BudgetStatus, Alert, AIInsight } from '../types';
 import BudgetProgressBar from '../components/BudgetProgressBar';
 import AIInsightCard from '../components/AIInsightCard';
@@ -29,20 +26,16 @@ const Dashboard: React.FC = () => {
   const loadDashboardData = async () => {
     setIsLoading(true);
     try {
-      const [budgets, summary, alertsData, insightsData] = await Promise.all([
-        budgetService.getStatus(),
-        transactionService.getSummary(),
-        alertService.getAll(true),
-        aiService.getInsights(),
-      ]);
+      const dashboard = await dashboardService.get(5, 3);
+      const budgets = dashboard.budget_status;
 
       setBudgetStatus(budgets);
       const total = budgets.reduce((sum, b) => sum + b.budget_limit, 0);
       const spent = budgets.reduce((sum, b) => sum + b.spent, 0);
       setTotalBudget(total);
       setTotalSpent(spent);
-      setAlerts(alertsData.slice(0, 5));
-      setInsights(insightsData.slice(0, 3));
+      setAlerts(dashboard.alerts);
+      setInsights(dashboard.insights);
     } catch (error) {
       console.error('Failed to load dashboard data:', error);
     } finally {
@@ -21,6 +21,33 @@ export interface LifeEventRequest {
   description?: string;
 }
 
+export interface LifeEvent {
+  id: string;
+  event_type: string;
+  event_date: string;
+  description?: string;
+  adjustment_status: 'pending' | 'ready' | 'failed';
+  created_at: string;
+}
+
+export interface BudgetAdjustmentProposal {
+  id: string;
+  budget_id: string;
+  category_id: string;
+  category_name: string;
+  current_limit: number;
+  proposed_limit: number;
+  adjustment_percentage?: number;
+  reasoning?: string;
+  status: 'pending' | 'applied';
+  created_at: string;
+}
+
+export interface LifeEventProposals {
+  event: LifeEvent;
+  proposals: BudgetAdjustmentProposal[];
+}
+
 export interface AIInsight {
   id: string;
   insight_type?: string;
@@ -43,11 +70,16 @@ export const aiService = {
     return response.data;
   },
 
-  logLifeEvent: async (data: LifeEventRequest) => {
+  logLifeEvent: async (data: LifeEventRequest): Promise<LifeEvent> => {
     const response = await api.post('/api/ai/life-event', data);
     return response.data;
   },
 
+  getLifeEventProposals: async (eventId: string): Promise<LifeEventProposals> => {
+    const response = await api.get(`/api/ai/life-event/${eventId}/proposals`);
+    return response.data;
+  },
+
   getInsights: async (): Promise<AIInsight[]> => {
     const response = await api.get('/api/ai/insights');
     return response.data;
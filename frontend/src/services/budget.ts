@@ -14,6 +14,11 @@ export interface BudgetUpdate {
   rollover_enabled?: boolean;
 }
 
+export interface BulkBudgetUpdate {
+  updates?: Array<{ budget_id: string; monthly_limit: number }>;
+  proposal_ids?: string[];
+}
+
 export const budgetService = {
   getAll: async (): Promise<Budget[]> => {
     const response = await api.get('/api/budget');
@@ -35,6 +40,11 @@ export const budgetService = {
     return response.data;
   },
 
+  bulkUpdate: async (data: BulkBudgetUpdate): Promise<Budget[]> => {
+    const response = await api.patch('/api/budget/bulk', data);
+    return response.data;
+  },
+
   delete: async (id: string): Promise<void> => {
     await api.delete(`/api/budget/${id}`);
   },
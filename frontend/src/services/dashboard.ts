@@ -0,0 +1,9 @@
+import api from './api';
+import { DashboardData } from '../types';
+
+export const dashboardService = {
+  get: async (alertsLimit: number = 5, insightsLimit: number = 3): Promise<DashboardData> => {
+    const response = await api.get(`/api/dashboard?alerts_limit=${alertsLimit}&insights_limit=${insightsLimit}`);
+    return response.data;
+  },
+};
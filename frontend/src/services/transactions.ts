@@ -15,6 +15,10 @@ export interface TransactionFilters {
   start_date?: string;
   end_date?: string;
   category_id?: string;
+  q?: string;
+  min_amount?: number;
+  max_amount?: number;
+  cursor?: string;
   limit?: number;
   offset?: number;
 }
@@ -25,6 +29,10 @@ export const transactionService = {
     if (filters?.start_date) params.append('start_date', filters.start_date);
     if (filters?.end_date) params.append('end_date', filters.end_date);
     if (filters?.category_id) params.append('category_id', filters.category_id);
+    if (filters?.q) params.append('q', filters.q);
+    if (filters?.min_amount !== undefined) params.append('min_amount', filters.min_amount.toString());
+    if (filters?.max_amount !== undefined) params.append('max_amount', filters.max_amount.toString());
+    if (filters?.cursor) params.append('cursor', filters.cursor);
     if (filters?.limit) params.append('limit', filters.limit.toString());
     if (filters?.offset) params.append('offset', filters.offset.toString());
     
@@ -70,6 +70,21 @@ export interface AIInsight {
   is_read: boolean;
 }
 
+export interface TransactionSummary {
+  total_spent: number;
+  total_transactions: number;
+  category_breakdown: Record<string, number>;
+}
+
+export interface DashboardData {
+  month_start: string;
+  budget_status: BudgetStatus[];
+  summary: TransactionSummary;
+  alerts: Alert[];
+  unread_alert_count: number;
+  insights: AIInsight[];
+}
+
 export interface TokenResponse {
   access_token: string;
   refresh_token: string;